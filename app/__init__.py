@@ -8,7 +8,10 @@ from config import Config
 # authlib OAuth import
 from authlib.integrations.flask_client import OAuth
 
-db = SQLAlchemy()
+from .db_routing import RoutingSession
+
+# 공개 조회 라우트의 SELECT는 복제본으로 보낼 수 있는 세션 사용 (DATABASE_REPLICA_URL 설정 시)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 oauth = OAuth()
 cache = Cache()
@@ -23,6 +26,18 @@ def create_app(config_class=Config):
                 template_folder=os.path.join(base_dir, 'templates'))
     app.config.from_object(config_class)
 
+    # 템플릿 바이트코드 캐시 (jinja_env가 만들어지기 전에 설정해야 함)
+    from .template_cache import init_template_cache
+    init_template_cache(app)
+
+    # multipart 업로드 파일을 일정 크기 이상이면 디스크에 스풀
+    from .uploads import SpooledRequest
+    app.request_class = SpooledRequest
+
+    # DB 연결 풀 프로필 (엔진이 만들어지기 전에 옵션 설정)
+    from .db_pool import init_pool
+    init_pool(app)
+
     db.init_app(app)
     login_manager.init_app(app)
     oauth.init_app(app)
@@ -34,6 +49,29 @@ def create_app(config_class=Config):
     from .routes import bp as main_bp
     app.register_blueprint(main_bp)
     
+    # 기본 static 엔드포인트도 serve_static(사전 압축본/캐싱 헤더 처리)으로 처리
+    app.view_functions['static'] = app.view_functions['main.serve_static']
+    
+    # 템플릿 url_for('static')에 빌드된 지문 파일 경로 적용
+    from .assets import init_assets
+    init_assets(app)
+    
+    # 템플릿 반응형 이미지 헬퍼 (srcset / sizes / 지연 로드)
+    from .responsive import init_responsive_images
+    init_responsive_images(app)
+    
+    # 이미지 렌디션 디스크 캐시 (UPLOAD_FOLDER/renditions, 인덱스는 백그라운드에서 재구성)
+    from . import image_cache
+    image_cache.init_app(app)
+    
+    # HTML/JSON 응답 압축
+    from .compression import init_compression
+    init_compression(app)
+    
+    # CLI 명령 등록 (flask --app index <명령>)
+    from .cli import register_commands
+    register_commands(app)
+    
     # 인덱스 생성 (Postgres용)
     with app.app_context():
         try:
@@ -52,15 +90,11 @@ def create_app(config_class=Config):
             print(f"Info: Index creation check: {str(idx_error)}", file=sys.stderr)
     
     # 언어 설정을 템플릿에 전달하는 컨텍스트 프로세서
+    # (세션에 기본값을 쓰지 않으므로 익명 사용자 응답에는 쿠키가 붙지 않음)
     @app.context_processor
     def inject_language():
-        from flask import session
-        # 세션에서 언어 가져오기, 없으면 기본값 'ko' (한국어)
-        lang = session.get('language')
-        if not lang or lang not in ['ko', 'en']:
-            lang = 'ko'  # 기본값: 한국어
-            session['language'] = lang
-        return dict(current_lang=lang)
+        from .routes import get_language
+        return dict(current_lang=get_language())
 
     # Create DB tables and add missing columns
     with app.app_context():
@@ -74,24 +108,57 @@ def create_app(config_class=Config):
             try:
                 from sqlalchemy import text
                 columns = [
-                    ("image_data", "BYTEA"),
-                    ("image_mimetype", "VARCHAR(50)"),
-                    ("image_url", "VARCHAR(500)"),
-                    ("tistory_post_id", "VARCHAR(100)"),
-                    ("tistory_link", "VARCHAR(500)")
+                    ("post", "image_data", "BYTEA"),
+                    ("post", "image_mimetype", "VARCHAR(50)"),
+                    ("post", "image_url", "VARCHAR(500)"),
+                    ("post", "tistory_post_id", "VARCHAR(100)"),
+                    ("post", "tistory_link", "VARCHAR(500)"),
+                    ("post", "image_hash", "VARCHAR(64)"),
+                    ("post", "image_width", "INTEGER"),
+                    ("post", "image_height", "INTEGER"),
+                    ("post", "image_placeholder", "TEXT"),
+                    ("post", "image_color", "VARCHAR(7)"),
+                    ("post", "updated_at", "TIMESTAMP"),
+                    ("post", "content_html", "TEXT"),
+                    ("post_image", "image_hash", "VARCHAR(64)"),
+                    ("post_image", "image_width", "INTEGER"),
+                    ("post_image", "image_height", "INTEGER"),
+                    ("post_image", "image_placeholder", "TEXT"),
+                    ("post_image", "image_color", "VARCHAR(7)")
                 ]
-                for col_name, col_type in columns:
+                for table_name, col_name, col_type in columns:
                     db.session.execute(text(f"""
                         DO $$ 
                         BEGIN 
                             IF NOT EXISTS (
                                 SELECT 1 FROM information_schema.columns 
-                                WHERE table_name='post' AND column_name='{col_name}'
+                                WHERE table_name='{table_name}' AND column_name='{col_name}'
                             ) THEN
-                                ALTER TABLE post ADD COLUMN {col_name} {col_type};
+                                ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type};
                             END IF;
                         END $$;
                     """))
+                # post_image.post_id 외래 키를 ON DELETE CASCADE로 교체 (기존 테이블)
+                db.session.execute(text("""
+                    DO $$
+                    DECLARE fk_name text;
+                    BEGIN
+                        SELECT tc.constraint_name INTO fk_name
+                        FROM information_schema.table_constraints tc
+                        JOIN information_schema.referential_constraints rc
+                          ON rc.constraint_name = tc.constraint_name
+                        WHERE tc.table_name = 'post_image' AND tc.constraint_type = 'FOREIGN KEY'
+                          AND rc.delete_rule <> 'CASCADE';
+                        IF fk_name IS NOT NULL THEN
+                            EXECUTE format('ALTER TABLE post_image DROP CONSTRAINT %I', fk_name);
+                            ALTER TABLE post_image ADD CONSTRAINT post_image_post_id_fkey
+                                FOREIGN KEY (post_id) REFERENCES post (id) ON DELETE CASCADE;
+                        END IF;
+                    END $$;
+                """))
+                db.session.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_post_image_post_id ON post_image (post_id);
+                """))
                 # tistory_post_id에 유니크 인덱스 추가
                 db.session.execute(text("""
                     CREATE UNIQUE INDEX IF NOT EXISTS idx_post_tistory_post_id 
@@ -110,6 +177,22 @@ def create_app(config_class=Config):
             print(f"Warning: Could not create database tables: {str(e)}", file=sys.stderr)
             # 앱은 계속 실행됨 (테이블이 이미 존재하거나 다른 이유일 수 있음)
 
+    # 통계 카운터 초기화 (카운터 테이블이 비어 있으면 Post 테이블에서 한 번 계산)
+    with app.app_context():
+        try:
+            from .models import PostCounter
+            if PostCounter.query.get('total') is None:
+                PostCounter.rebuild()
+                db.session.commit()
+        except Exception as counter_error:
+            db.session.rollback()
+            import sys
+            print(f"Info: Post counter initialization: {str(counter_error)}", file=sys.stderr)
+
+    # 배포/재시작 직후 첫 방문자를 위한 캐시 예열 (백그라운드, flask CLI 명령 실행 시 제외)
+    from .warmup import schedule_startup_warmup
+    schedule_startup_warmup(app)
+
     # 티스토리 RSS 자동 동기화 스케줄러 설정
     # 데이터베이스 설정 우선, 없으면 환경 변수 사용
     with app.app_context():
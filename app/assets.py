@@ -0,0 +1,257 @@
+"""
+정적 파일 빌드 파이프라인 (최소화 / 파일명 지문 / 사전 압축)
+
+`flask --app index build-assets` 명령으로 static/ 아래 CSS, JS 파일을
+  1) 최소화하고
+  2) 내용 해시를 붙인 파일명으로 static/dist/ 에 저장한 뒤 (예: dist/css/base.3f2a9c1d07.css)
+  3) gzip / brotli(brotli 패키지가 설치된 경우) 사전 압축본(.gz / .br)을 함께 만든다.
+원본 경로 → 지문 경로 매핑은 static/dist/manifest.json 에 기록되며,
+템플릿의 url_for('static', filename=...) 가 이 매니페스트를 참고한다.
+매니페스트가 없으면 원본 파일을 그대로 사용한다.
+"""
+import os
+import re
+import json
+import gzip
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+BUILD_EXTENSIONS = ('.css', '.js')
+
+# 사전 압축본 확장자 (선호 순서)
+PRECOMPRESSED_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)', re.S)
+
+_manifest_cache = {}
+
+
+def minify_css(text):
+    """CSS 최소화 (주석/공백 제거, 문자열 내부는 그대로 유지)"""
+    parts = []
+    pos = 0
+    for match in _STRING_OR_COMMENT.finditer(text):
+        parts.append(_collapse_css(text[pos:match.start()]))
+        if match.group(1):
+            parts.append(match.group(1))
+        pos = match.end()
+    parts.append(_collapse_css(text[pos:]))
+    return ''.join(parts).strip()
+
+
+def _collapse_css(segment):
+    segment = re.sub(r'\s+', ' ', segment)
+    segment = re.sub(r'\s*([{};,>])\s*', r'\1', segment)
+    return segment.replace(';}', '}')
+
+
+def minify_js(text):
+    """JS 최소화 (보수적 - 줄 앞뒤 공백, 빈 줄, 한 줄 주석만 제거)
+
+    파서 없이 안전하게 처리할 수 있는 범위만 줄인다. 줄바꿈은 유지하므로
+    자동 세미콜론 삽입 동작은 바뀌지 않는다. 여러 줄에 걸친 템플릿 리터럴 안의 줄은
+    공백까지 문자열 값이므로 그대로 둔다.
+    """
+    lines = []
+    for line, start, end in _js_line_contexts(text):
+        if start in ('code', 'block'):
+            line = line.lstrip()
+        if end in ('code', 'block'):
+            line = line.rstrip()
+        if start == 'code' and (not line or line.startswith('//')):
+            continue
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+# 이 문자 뒤의 /는 나눗셈이 아니라 정규식 리터럴의 시작
+_REGEX_PRECEDERS = '(,=:[!&|?{};+-*%<>~^'
+
+
+def _js_line_contexts(text):
+    """줄마다 (줄, 시작 위치의 문맥, 끝 위치의 문맥)
+
+    문맥은 'code', 'block'(블록 주석), 문자열/템플릿 리터럴 따옴표(' " `) 중 하나다.
+    템플릿 리터럴의 ${...} 중첩과 정규식 리터럴을 구분해 그 안의 //를 주석으로 보지 않는다.
+    """
+    state = 'code'
+    templates = []  # ${ ... } 안에서 열린 중괄호 수 (템플릿 중첩 단계별)
+    prev = ''       # 직전의 공백이 아닌 코드 문자 (정규식 리터럴 판별용)
+    result = []
+    for line in text.splitlines():
+        start = state
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            following = line[i + 1:i + 2]
+            if state == 'code':
+                if ch in '\'"`':
+                    state = ch
+                elif ch == '/' and following == '/':
+                    break
+                elif ch == '/' and following == '*':
+                    state = 'block'
+                    i += 1
+                elif ch == '/' and (not prev or prev in _REGEX_PRECEDERS):
+                    state = 'regex'
+                elif ch == '{' and templates:
+                    templates[-1] += 1
+                elif ch == '}' and templates:
+                    if templates[-1]:
+                        templates[-1] -= 1
+                    else:
+                        templates.pop()
+                        state = '`'
+                if not ch.isspace():
+                    prev = ch
+            elif state == 'block':
+                if ch == '*' and following == '/':
+                    state = 'code'
+                    i += 1
+            elif state in ('regex', 'regex_class'):
+                if ch == '\\':
+                    i += 1
+                elif ch == '[':
+                    state = 'regex_class'
+                elif ch == ']' and state == 'regex_class':
+                    state = 'regex'
+                elif ch == '/' and state == 'regex':
+                    state, prev = 'code', ch
+            else:
+                if ch == '\\':
+                    i += 1
+                elif ch == state:
+                    state, prev = 'code', ch
+                elif state == '`' and ch == '$' and following == '{':
+                    templates.append(0)
+                    state, prev = 'code', '{'
+                    i += 1
+            i += 1
+        # 정규식과 ' " 문자열은 줄을 넘지 않음 (줄 끝 \ 이어쓰기 제외) - 판별이 틀려도 다음 줄부터 복구
+        if state in ('regex', 'regex_class') or (state in '\'"' and not line.endswith('\\')):
+            state = 'code'
+        result.append((line, start, state))
+    return result
+
+
+def _compress(data):
+    """gzip / brotli 압축본 생성 ({encoding: bytes})"""
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+        variants['br'] = brotli.compress(data, quality=11)
+    except ImportError:
+        pass
+    return variants
+
+
+def build_assets(static_dir):
+    """CSS/JS 빌드 후 매니페스트 반환 ({원본 경로: 지문 경로})"""
+    manifest = {}
+    dist_root = os.path.join(static_dir, DIST_DIR)
+
+    for root, dirs, files in os.walk(static_dir):
+        # 빌드 결과물과 업로드 폴더는 제외
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != dist_root and d != 'uploads']
+        for name in sorted(files):
+            if not name.endswith(BUILD_EXTENSIONS):
+                continue
+            src_path = os.path.join(root, name)
+            rel_path = os.path.relpath(src_path, static_dir).replace(os.sep, '/')
+
+            with open(src_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            minified = minify_css(text) if name.endswith('.css') else minify_js(text)
+            data = minified.encode('utf-8')
+
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            base, ext = os.path.splitext(rel_path)
+            hashed_rel = f'{DIST_DIR}/{base}.{digest}{ext}'
+            hashed_path = os.path.join(static_dir, *hashed_rel.split('/'))
+            os.makedirs(os.path.dirname(hashed_path), exist_ok=True)
+
+            _write_file(hashed_path, data)
+            variants = _compress(data)
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                compressed = variants.get(encoding)
+                if compressed is not None and len(compressed) < len(data):
+                    _write_file(hashed_path + suffix, compressed)
+
+            manifest[rel_path] = hashed_rel
+            logger.info(f"{rel_path} -> {hashed_rel} ({len(text.encode('utf-8'))} -> {len(data)} bytes)")
+
+    os.makedirs(dist_root, exist_ok=True)
+    _write_file(os.path.join(dist_root, MANIFEST_NAME),
+                json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    _manifest_cache.clear()
+    return manifest
+
+
+def _write_file(path, data):
+    """임시 파일에 쓴 뒤 교체 (서빙 중인 파일이 반쯤 써진 상태로 보이지 않도록)"""
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(static_dir):
+    """매니페스트 로드 (파일 수정 시각 기준으로 캐싱, 없으면 빈 dict)"""
+    path = os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"정적 파일 매니페스트 로드 실패: {str(e)}")
+        manifest = {}
+    _manifest_cache[path] = (mtime, manifest)
+    return manifest
+
+
+def is_fingerprinted(filename):
+    """빌드된 지문 파일인지 확인 (내용이 바뀌면 파일명도 바뀌므로 영구 캐싱 가능)"""
+    return filename.startswith(DIST_DIR + '/') and not filename.endswith(MANIFEST_NAME)
+
+
+def find_precompressed(static_dir, filename, accept_encodings):
+    """Accept-Encoding에 맞는 사전 압축본 찾기
+
+    Args:
+        accept_encodings: request.accept_encodings (q 값 반영 - q=0으로 거부한 인코딩은 보내지 않음)
+
+    Returns:
+        (전송할 파일명, Content-Encoding 또는 None, 압축본 존재 여부)
+    """
+    available = {encoding: suffix for encoding, suffix in PRECOMPRESSED_ENCODINGS
+                 if os.path.isfile(os.path.join(static_dir, filename + suffix))}
+    if not available:
+        return filename, None, False
+    # q 값이 같으면 PRECOMPRESSED_ENCODINGS 순서(brotli 우선)
+    encoding = accept_encodings.best_match(list(available)) if accept_encodings is not None else None
+    if encoding:
+        return filename + available[encoding], encoding, True
+    return filename, None, True
+
+
+def init_assets(app):
+    """템플릿의 url_for('static')이 매니페스트의 지문 경로를 사용하도록 설정"""
+    from flask import url_for
+
+    def asset_url_for(endpoint, **values):
+        if endpoint == 'static' and 'filename' in values:
+            manifest = load_manifest(app.static_folder)
+            values['filename'] = manifest.get(values['filename'], values['filename'])
+        return url_for(endpoint, **values)
+
+    app.jinja_env.globals['url_for'] = asset_url_for
@@ -0,0 +1,84 @@
+"""
+관리용 CLI 명령
+
+사용 예:
+    flask --app index build-assets
+    flask --app index warm-cache --pages 3
+    flask --app index recompress-images --workers 4
+    flask --app index export-static --output build/site
+    flask --app index precompile-templates
+    flask --app index render-content
+"""
+import click
+
+
+def register_commands(app):
+    """Flask 앱에 CLI 명령 등록"""
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        """CSS/JS 최소화 + 지문 파일명 + gzip/brotli 사전 압축"""
+        from .assets import build_assets
+        manifest = build_assets(app.static_folder)
+        for source, target in sorted(manifest.items()):
+            click.echo(f'{source} -> {target}')
+        click.echo(f'{len(manifest)}개 파일 빌드 완료 (static/dist/manifest.json)')
+
+    @app.cli.command('warm-cache')
+    @click.option('--category', 'categories', multiple=True,
+                  type=click.Choice(['gallery', 'archive_1', 'archive_2']),
+                  help='예열할 카테고리 (여러 번 지정 가능, 기본: 전체)')
+    @click.option('--pages', type=int, default=None, help='카테고리별 예열할 페이지 수')
+    @click.option('--images', type=int, default=None, help='예열할 최신 갤러리 이미지 수')
+    def warm_cache_command(categories, pages, images):
+        """홈/목록 페이지와 최신 이미지 렌디션 캐시 예열"""
+        from .warmup import warm_cache
+        requested, failed = warm_cache(app, categories=list(categories) or None, pages=pages, image_limit=images)
+        click.echo(f'{requested}개 URL 예열 완료 (실패 {failed}개)')
+
+    @app.cli.command('recompress-images')
+    @click.option('--chunk-size', type=int, default=20, help='한 번에 읽을 행 수 (이미지 데이터가 메모리에 올라감)')
+    @click.option('--workers', type=int, default=None, help='재압축 프로세스 수 (기본: CPU 수)')
+    @click.option('--quality', type=int, default=85, help='JPEG 품질')
+    @click.option('--dry-run', is_flag=True, help='DB를 바꾸지 않고 절감량만 계산')
+    @click.option('--restart', is_flag=True, help='저장된 진행 위치를 무시하고 처음부터')
+    def recompress_images_command(chunk_size, workers, quality, dry_run, restart):
+        """저장된 이미지 재압축 (EXIF 방향 적용, 메타데이터 제거, 작아질 때만 교체)"""
+        from .recompress import recompress_library
+        totals = recompress_library(app, chunk_size=chunk_size, workers=workers, quality=quality,
+                                    dry_run=dry_run, restart=restart, echo=click.echo)
+        click.echo(
+            f"{totals['scanned']}개 확인, {totals['replaced']}개 교체, {totals['backfilled']}개 해시 채움, "
+            f"{totals['failed']}개 실패 - {totals['bytes_reclaimed'] / 1024 / 1024:.2f} MB 절감"
+            + (' (dry run)' if dry_run else '')
+        )
+
+    @app.cli.command('export-static')
+    @click.option('--output', default='build/site', show_default=True, help='내보낼 폴더')
+    @click.option('--language', type=click.Choice(['ko', 'en']), default='ko', show_default=True, help='페이지 언어')
+    @click.option('--full', is_flag=True, help='이전 내보내기 기록을 무시하고 전체 다시 만들기')
+    def export_static_command(output, language, full):
+        """공개 페이지/이미지/static 파일을 정적 사이트로 내보내기 (바뀐 파일만)"""
+        from .static_export import export_site
+        totals = export_site(app, output, language=language, full=full, echo=click.echo)
+        click.echo(
+            f"페이지 {totals['pages']}개, 이미지 {totals['images']}개, static {totals['static']}개 생성 / "
+            f"{totals['skipped']}개 유지, {totals['removed']}개 삭제 → {output}"
+        )
+
+    @app.cli.command('precompile-templates')
+    @click.option('--output', default=None, help='저장 폴더 (기본: TEMPLATE_BYTECODE_DIR)')
+    def precompile_templates_command(output):
+        """templates/의 모든 템플릿을 바이트코드로 미리 컴파일 (배포 전 실행)"""
+        from .template_cache import precompile_templates
+        count, directory = precompile_templates(app, output)
+        click.echo(f'템플릿 {count}개 컴파일 → {directory}')
+
+    @app.cli.command('render-content')
+    @click.option('--chunk-size', type=int, default=100, help='한 번에 처리할 게시글 수')
+    @click.option('--all', 'rerender', is_flag=True, help='이미 변환된 게시글도 다시 변환 (변환 규칙 변경 후)')
+    def render_content_command(chunk_size, rerender):
+        """게시글 본문 HTML 정리 결과(content_html) 채우기"""
+        from .content import backfill_content
+        count = backfill_content(app, chunk_size=chunk_size, rerender=rerender, echo=click.echo)
+        click.echo(f'{count}개 게시글 본문 변환 완료')
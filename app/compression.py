@@ -0,0 +1,123 @@
+"""
+동적 응답(HTML/JSON) 압축 미들웨어
+
+압축 프록시가 없는 자체 호스팅 환경을 위해 텍스트 응답을 gzip 또는 brotli
+(brotli 패키지가 설치된 경우)로 압축한다. 이미지 등 이미 압축된 응답은 건너뛴다.
+
+스트리밍 응답(render_chunks)은 조각마다 압축 스트림을 flush해서 보내므로
+압축을 하더라도 <head>가 담긴 첫 조각이 본문 렌더링을 기다리지 않고 전송된다.
+
+ETag가 있는 응답(목록 페이지/API)은 압축 결과를 페이지 캐시와 같은 캐시에
+'compressed:<ETag>:<인코딩>' 키로 저장해 같은 페이지를 다시 압축하지 않는다.
+ETag는 게시글 세대 번호로 만들어지므로 글이 바뀌면 키도 자연스럽게 바뀐다.
+"""
+import gzip
+import zlib
+import logging
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+}
+
+
+def choose_encoding():
+    """Accept-Encoding에서 사용할 인코딩 선택 (brotli 우선)"""
+    supported = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(supported)
+
+
+def compress_body(data, encoding, config):
+    """응답 본문 압축"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESS_BR_QUALITY', 5))
+    return gzip.compress(data, compresslevel=config.get('COMPRESS_LEVEL', 6))
+
+
+def compress_stream(chunks, encoding, config):
+    """스트리밍 응답 압축 - 조각마다 flush해 받은 만큼 바로 풀 수 있게 함"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config.get('COMPRESS_BR_QUALITY', 5))
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        # wbits 16+MAX_WBITS: gzip 헤더/트레일러 포함
+        compressor = zlib.compressobj(config.get('COMPRESS_LEVEL', 6), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def init_compression(app):
+    """after_request 훅으로 압축 미들웨어 등록"""
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config.get('COMPRESS_ENABLED', True):
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        # 압축 여부와 관계없이 응답이 Accept-Encoding에 따라 달라짐을 알림
+        # (304 응답도 200과 같은 Vary를 보내야 캐시가 압축본/원본을 구분함)
+        response.vary.add('Accept-Encoding')
+
+        if (response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+
+        encoding = choose_encoding()
+        if not encoding:
+            return response
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, app.config)
+            response.headers['Content-Encoding'] = encoding
+            response.headers.pop('Content-Length', None)
+            etag, weak = response.get_etag()
+            if etag and not weak:
+                response.set_etag(etag, weak=True)
+            return response
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+
+        etag, _ = response.get_etag()
+        cache_key = f'compressed:{etag}:{encoding}' if etag else None
+        compressed = None
+        if cache_key:
+            from . import cache
+            compressed = cache.get(cache_key)
+        if compressed is None:
+            compressed = compress_body(data, encoding, app.config)
+            if cache_key:
+                cache.set(cache_key, compressed, timeout=app.config.get('COMPRESS_CACHE_TIMEOUT', 120))
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # 인코딩이 다른 표현이므로 약한 ETag로 변경 (If-None-Match는 약한 비교)
+            response.set_etag(etag, weak=True)
+        return response
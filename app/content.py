@@ -0,0 +1,167 @@
+"""
+게시글 본문 HTML 후처리 (저장/동기화 시 한 번만 실행 → Post.content_html)
+
+티스토리 본문은 원본 크기의 blog.kakaocdn.net 이미지를 지연 로드/크기 속성 없이 포함하고
+편집기 전용 속성(data-ke-*, onerror 등)이 많이 붙어 있다. 상세 페이지에서 매 요청 처리하지 않도록
+저장 시점에 다음과 같이 정리한 결과를 content_html 컬럼에 저장한다.
+  - kakaocdn 원본 이미지 → 티스토리 썸네일 서버(daumcdn) 너비별 WebP srcset
+  - /image/<id>, /post/image/<id> 이미지 → 렌디션 srcset (responsive.srcset)
+  - data-origin-width/height로 width/height 지정 (레이아웃 이동 방지)
+  - 첫 이미지를 제외하고 loading="lazy", 모든 이미지 decoding="async"
+  - 주석, script, 편집기 전용 속성, 속성 없는 span 래퍼 제거
+원본 content는 그대로 두므로 규칙이 바뀌면 render-content 명령으로 다시 만들 수 있다.
+"""
+import re
+import logging
+from urllib.parse import quote
+from bs4 import BeautifulSoup, Comment
+
+logger = logging.getLogger(__name__)
+
+# 본문 이미지 너비 단계 (상세 본문 최대 폭 1200px 기준, 고해상도 화면 포함)
+CONTENT_WIDTHS = [480, 800, 1280, 1600]
+CONTENT_DEFAULT_WIDTH = 800
+
+THUMBNAIL_SERVER = 'https://i1.daumcdn.net/thumb/R{width}x0.fwebp.q85/?scode=mtistory2&fname={fname}'
+
+# 제거할 편집기 전용 속성 (접두사 또는 이름)
+STRIP_ATTRIBUTE_PREFIXES = ('data-ke-', 'data-origin-', 'data-phocus', 'data-filename', 'data-url', 'on')
+REMOVE_TAGS = ('script', 'noscript')
+
+_KAKAOCDN = re.compile(r'^(?:https?:)?//blog\.kakaocdn\.net/', re.IGNORECASE)
+
+
+def _int_attr(tag, name):
+    """정수 속성 값 (없거나 숫자가 아니면 None)"""
+    if tag is None:
+        return None
+    try:
+        value = int(float(str(tag.get(name, '')).replace('px', '')))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def _intrinsic_size(img):
+    """원본 크기 - img 또는 상위 figure의 data-origin-*, 없으면 width/height 속성"""
+    figure = img.find_parent('figure')
+    for tag in (img, figure):
+        width, height = _int_attr(tag, 'data-origin-width'), _int_attr(tag, 'data-origin-height')
+        if width and height:
+            return width, height
+    return _int_attr(img, 'width'), _int_attr(img, 'height')
+
+
+def thumbnail_srcset(original_url, intrinsic_width=None):
+    """kakaocdn 원본 URL → (src, srcset) 티스토리 썸네일 서버 URL"""
+    from .responsive import rendition_widths
+
+    if original_url.startswith('//'):
+        original_url = 'https:' + original_url
+    fname = quote(original_url, safe='')
+    widths = rendition_widths(intrinsic_width, CONTENT_WIDTHS)
+    src_width = min(CONTENT_DEFAULT_WIDTH, intrinsic_width) if intrinsic_width else CONTENT_DEFAULT_WIDTH
+    src = THUMBNAIL_SERVER.format(width=src_width, fname=fname)
+    return src, ', '.join(f'{THUMBNAIL_SERVER.format(width=w, fname=fname)} {w}w' for w in widths)
+
+
+def _rewrite_image(img, eager):
+    from .responsive import srcset, DETAIL_SIZES
+    from .tistory_sync import decode_tistory_image_url
+
+    src = img.get('src') or img.get('data-src') or ''
+    src = decode_tistory_image_url(src)
+    width, height = _intrinsic_size(img)
+
+    attributes = {}
+    if _KAKAOCDN.match(src):
+        attributes['src'], attributes['srcset'] = thumbnail_srcset(src, width)
+        attributes['sizes'] = DETAIL_SIZES
+    else:
+        local_srcset = srcset(src, width, CONTENT_WIDTHS)
+        if local_srcset:
+            src_width = min(CONTENT_DEFAULT_WIDTH, width) if width else CONTENT_DEFAULT_WIDTH
+            attributes['src'] = f'{src}?w={src_width}'
+            attributes['srcset'] = local_srcset
+            attributes['sizes'] = DETAIL_SIZES
+        else:
+            attributes['src'] = src
+    attributes['alt'] = img.get('alt') or ''
+    if width and height:
+        attributes['width'] = str(width)
+        attributes['height'] = str(height)
+    if not eager:
+        attributes['loading'] = 'lazy'
+    attributes['decoding'] = 'async'
+    img.attrs = attributes
+
+
+def render_content(html):
+    """본문 HTML 정리 결과 (빈 본문이면 None)"""
+    if not html or not html.strip():
+        return None
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+    for tag in soup.find_all(REMOVE_TAGS):
+        tag.decompose()
+
+    for index, img in enumerate(soup.find_all('img')):
+        if not (img.get('src') or img.get('data-src')):
+            img.decompose()
+            continue
+        # 첫 이미지는 첫 화면에 보일 가능성이 높으므로 즉시 로드
+        _rewrite_image(img, eager=index == 0)
+
+    for tag in soup.find_all(True):
+        if tag.name == 'img':
+            continue
+        for name in list(tag.attrs):
+            if name.lower().startswith(STRIP_ATTRIBUTE_PREFIXES):
+                del tag.attrs[name]
+        if tag.name == 'span' and not tag.attrs:
+            tag.unwrap()
+
+    return str(soup).strip()
+
+
+def content_html_for(html):
+    """저장용 content_html 값 (변환에 실패하면 None - 상세 페이지는 원본 content를 표시)"""
+    try:
+        return render_content(html)
+    except Exception as e:
+        logger.warning(f"본문 HTML 변환 실패: {str(e)}")
+        return None
+
+
+def backfill_content(app, chunk_size=100, rerender=False, echo=logger.info):
+    """content_html이 비어 있는 게시글 일괄 변환 (rerender=True면 전체 다시 변환)
+
+    Returns:
+        변환한 게시글 수
+    """
+    from . import db
+    from .models import Post
+
+    count, last_id = 0, 0
+    with app.app_context():
+        while True:
+            query = db.session.query(Post.id, Post.content).filter(Post.id > last_id, Post.content.isnot(None))
+            if not rerender:
+                query = query.filter(Post.content_html.is_(None))
+            rows = query.order_by(Post.id).limit(chunk_size).all()
+            if not rows:
+                break
+            for row in rows:
+                try:
+                    content_html = render_content(row.content)
+                except Exception as e:
+                    echo(f'post {row.id}: 변환 실패 ({str(e)})')
+                    continue
+                Post.query.filter_by(id=row.id).update({'content_html': content_html}, synchronize_session=False)
+                count += 1
+            db.session.commit()
+            last_id = rows[-1].id
+            echo(f'id {last_id}까지 처리 ({count}개 변환)')
+    return count
@@ -0,0 +1,147 @@
+"""
+DB 연결 풀 프로필 (DB_POOL_PROFILE) + 체크아웃 시간 측정
+
+  - serverless: 요청마다 연결을 열고 닫는 NullPool (Vercel 인스턴스마다 풀을 잡고 있지 않음).
+    Vercel Postgres/pgbouncer 트랜잭션 모드에서도 안전하도록 서버 측 prepared statement를 쓰지 않는다
+    (psycopg2는 원래 쓰지 않고, psycopg 3는 prepare_threshold=None).
+  - server: 크기가 정해진 QueuePool (pool_size + max_overflow, LIFO).
+    LIFO는 최근에 쓴 연결을 다시 써서 유휴 연결이 pool_recycle 전에 자연스럽게 정리되게 한다.
+    체크아웃마다 SELECT 1을 보내는 pool_pre_ping 대신, 끊긴 연결로 오류가 나면 SQLAlchemy가
+    풀 전체를 무효화하고 다음 체크아웃에서 새로 연결한다 (끊김 횟수는 통계에 기록).
+  - custom: SQLALCHEMY_ENGINE_OPTIONS를 그대로 사용
+
+두 프로필 모두 풀 클래스를 측정용 서브클래스로 바꿔 체크아웃 시간(대기 + 새 연결 시간)을
+워커 프로세스 단위로 집계한다 (/admin/cache/stats의 db_pool).
+"""
+import time
+import threading
+import logging
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, NullPool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+POOL_PROFILES = ('serverless', 'server', 'custom')
+
+_stats = {
+    'checkouts': 0,       # 풀에서 연결을 꺼낸 횟수
+    'checkout_ms': 0.0,   # 체크아웃 총 시간 (대기 + 새 연결)
+    'max_checkout_ms': 0.0,
+    'wait_ms': 0.0,       # 그중 풀이 비어 반납을 기다린 시간
+    'connects': 0,        # 새 DB 연결 수
+    'connect_ms': 0.0,
+    'timeouts': 0,        # pool_timeout 초과
+    'disconnects': 0,     # 끊긴 연결 감지 (풀 무효화 후 재연결)
+}
+_stats_lock = threading.Lock()
+_local = threading.local()
+
+
+class PoolTimingMixin:
+    """_do_get(체크아웃)과 _create_connection(새 연결) 시간 측정"""
+
+    def _do_get(self):
+        if getattr(_local, 'depth', 0):
+            # QueuePool._do_get은 재귀 호출될 수 있음 - 가장 바깥 호출만 측정
+            return super()._do_get()
+        _local.depth, _local.connect_ms = 1, 0.0
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with _stats_lock:
+                _stats['timeouts'] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            _local.depth = 0
+            with _stats_lock:
+                _stats['checkouts'] += 1
+                _stats['checkout_ms'] += elapsed
+                _stats['max_checkout_ms'] = max(_stats['max_checkout_ms'], elapsed)
+                _stats['wait_ms'] += max(0.0, elapsed - _local.connect_ms)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            _local.connect_ms = getattr(_local, 'connect_ms', 0.0) + elapsed
+            with _stats_lock:
+                _stats['connects'] += 1
+                _stats['connect_ms'] += elapsed
+
+
+class InstrumentedQueuePool(PoolTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(PoolTimingMixin, NullPool):
+    pass
+
+
+def stats(engine=None):
+    """풀 통계 (워커 프로세스 단위). engine을 넘기면 현재 풀 상태도 포함"""
+    with _stats_lock:
+        result = dict(_stats)
+    checkouts = result['checkouts'] or 1
+    result['avg_checkout_ms'] = round(result['checkout_ms'] / checkouts, 3)
+    result['avg_wait_ms'] = round(result['wait_ms'] / checkouts, 3)
+    for key in ('checkout_ms', 'max_checkout_ms', 'wait_ms', 'connect_ms'):
+        result[key] = round(result[key], 3)
+    if engine is not None:
+        result['pool'] = engine.pool.status()
+        result['pool_class'] = type(engine.pool).__name__
+    return result
+
+
+def engine_options(config):
+    """DB_POOL_PROFILE에 맞는 SQLALCHEMY_ENGINE_OPTIONS"""
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    profile = config.get('DB_POOL_PROFILE', 'server')
+    if profile not in POOL_PROFILES:
+        raise ValueError(f'Unknown DB_POOL_PROFILE: {profile} (choose from {", ".join(POOL_PROFILES)})')
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or ''
+    if profile == 'custom' or uri == 'sqlite://' or (uri.startswith('sqlite') and ':memory:' in uri):
+        # 메모리 SQLite는 연결마다 DB가 달라지므로 기본 풀(SingletonThreadPool/StaticPool) 유지
+        return options
+
+    options.pop('pool_pre_ping', None)
+    if profile == 'serverless':
+        options['poolclass'] = InstrumentedNullPool
+        for key in ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_use_lifo'):
+            options.pop(key, None)
+        if uri.startswith('postgresql+psycopg:'):
+            # psycopg 3의 자동 prepared statement는 트랜잭션 모드 pgbouncer에서 충돌
+            options['connect_args'] = dict(options.get('connect_args') or {}, prepare_threshold=None)
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.get('DB_POOL_SIZE', 5),
+            max_overflow=config.get('DB_POOL_MAX_OVERFLOW', 10),
+            pool_timeout=config.get('DB_POOL_TIMEOUT', 10),
+            pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+            pool_use_lifo=True,
+        )
+    return options
+
+
+def init_pool(app):
+    """db.init_app() 전에 호출 - 프로필에 맞게 엔진 옵션 설정"""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    if not event.contains(Engine, 'handle_error', _record_disconnect):
+        event.listen(Engine, 'handle_error', _record_disconnect)
+
+
+def _record_disconnect(context):
+    """끊긴 연결로 인한 오류 횟수 기록 (pre-ping 대신 오류 후 재연결 방식)
+
+    SQLAlchemy가 끊김을 감지하면 풀의 연결을 모두 무효화하므로 다음 체크아웃은 새 연결을 만든다.
+    """
+    if context.is_disconnect:
+        with _stats_lock:
+            _stats['disconnects'] += 1
+        logger.warning('DB 연결이 끊겨 풀의 연결을 다시 만듭니다.')
@@ -0,0 +1,133 @@
+"""
+읽기 전용 복제본(replica) 라우팅 (DATABASE_REPLICA_URL 설정 시)
+
+SQLALCHEMY_BINDS['replica']로 복제본 엔진을 만들고, RoutingSession.get_bind()가
+@replica_read 를 붙인 공개 조회 라우트(홈, 목록, 상세, 이미지, API)의 SELECT만 복제본으로 보낸다.
+INSERT/UPDATE/DELETE, flush, text() 쿼리와 그 밖의 라우트는 모두 기본(primary) DB를 사용한다.
+
+복제본을 쓰지 않고 primary로 읽는 경우
+  - 글 작성/수정/삭제 직후 REPLICA_READ_YOUR_WRITES_SECONDS 동안 해당 사용자의 요청
+    (세션에 시각 저장 - 자기가 쓴 글이 목록에 바로 보이도록)
+  - 복제 지연: REPLICA_CHECK_INTERVAL초마다 카테고리 세대 번호(PostCounter generation:*)를
+    primary와 비교해 복제본이 뒤처져 있으면 따라잡을 때까지 primary 사용
+  - 복제본 연결 오류
+두 개의 로컬 Postgres 또는 SQLite 파일(복제본은 primary 파일을 복사)로 시험할 수 있다.
+"""
+import time
+import threading
+import logging
+from functools import wraps
+from flask import g, session, current_app, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, select
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+PRIMARY_UNTIL_KEY = 'db_primary_until'
+
+_state = {'checked_at': 0.0, 'fresh': False}
+_state_lock = threading.Lock()
+_stats = {
+    'replica_requests': 0,   # 복제본으로 읽은 요청
+    'primary_pinned': 0,     # 쓰기 직후라 primary로 읽은 요청
+    'primary_lagging': 0,    # 복제 지연/오류로 primary로 읽은 요청
+    'lag_checks': 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def stats():
+    with _stats_lock:
+        result = dict(_stats)
+    result['replica_fresh'] = _state['fresh']
+    return result
+
+
+class RoutingSession(Session):
+    """요청에 복제본 사용 표시(g.db_replica)가 있으면 SELECT를 복제본 엔진으로 보내는 세션"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and isinstance(clause, Select)
+                and has_app_context() and g.get('db_replica')):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_configured():
+    return REPLICA_BIND in (current_app.config.get('SQLALCHEMY_BINDS') or {})
+
+
+def _generations(connection):
+    from .models import PostCounter
+    rows = connection.execute(
+        select(PostCounter.key, PostCounter.value).where(PostCounter.key.like('generation:%'))
+    )
+    return {key: value for key, value in rows}
+
+
+def replica_is_fresh():
+    """복제본이 primary를 따라잡았는지 (REPLICA_CHECK_INTERVAL초 동안 결과 재사용)"""
+    from . import db
+
+    interval = current_app.config.get('REPLICA_CHECK_INTERVAL', 5)
+    now = time.time()
+    if now - _state['checked_at'] < interval:
+        return _state['fresh']
+    with _state_lock:
+        if now - _state['checked_at'] < interval:
+            return _state['fresh']
+        _count('lag_checks')
+        try:
+            with db.engine.connect() as primary_conn:
+                primary = _generations(primary_conn)
+            with db.engines[REPLICA_BIND].connect() as replica_conn:
+                replica = _generations(replica_conn)
+            fresh = all(replica.get(key, 0) >= value for key, value in primary.items())
+            if not fresh:
+                logger.info('복제본이 primary보다 뒤처져 있어 primary에서 읽습니다.')
+        except Exception as e:
+            logger.warning(f"복제본 상태 확인 실패, primary 사용: {str(e)}")
+            fresh = False
+        _state.update(checked_at=time.time(), fresh=fresh)
+        return fresh
+
+
+def mark_stale():
+    """다음 요청에서 복제 지연을 다시 확인하도록 (이 프로세스에서 쓰기 직후)"""
+    _state['checked_at'] = 0.0
+
+
+def pin_primary():
+    """글 작성/수정/삭제 후 이 사용자의 요청은 한동안 primary에서 읽기 (read-your-writes)"""
+    if not replica_configured():
+        return
+    session[PRIMARY_UNTIL_KEY] = time.time() + current_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+    mark_stale()
+
+
+def replica_read(view):
+    """공개 조회 라우트 데코레이터 - 가능하면 SELECT를 복제본으로 보냄"""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        use_replica = False
+        if replica_configured():
+            if session.get(PRIMARY_UNTIL_KEY, 0) > time.time():
+                _count('primary_pinned')
+            elif replica_is_fresh():
+                use_replica = True
+                _count('replica_requests')
+            else:
+                _count('primary_lagging')
+        g.db_replica = use_replica
+        return view(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,276 @@
+"""
+이미지 캐시 (프로세스 메모리 LRU + 디스크 렌디션 캐시)
+
+1) 메모리: get_image / get_post_image가 DB에 접근하기 전에 먼저 확인한다.
+   키는 이미지 종류 + id + 렌디션(크기/포맷)이며, 값은 (바이트, MIME 타입, ETag) 튜플이다.
+   edit_post / delete_post에서 게시글 이미지가 바뀌면 처리한 워커의 해당 항목을 바로 삭제하고,
+   다른 워커/인스턴스의 항목은 IMAGE_CACHE_TTL초 뒤 만료되어 다시 읽는다 (이전 이미지가 남는 최대 시간).
+2) 디스크: UPLOAD_FOLDER/renditions 에 get_image / get_post_image 결과(리사이즈/변환된 이미지)를 저장한다.
+   파일명은 원본 내용 해시 + 크기 + 포맷(avif/webp/jpeg) + 확장자이므로 이미지가 바뀌면 파일명도 바뀐다.
+   임시 파일에 쓴 뒤 교체(원자적 쓰기)하고, 전체 용량을 넘으면 접근 시각이 오래된 순으로 삭제한다.
+   앱 시작 시 기존 파일 목록(인덱스)을 백그라운드에서 다시 만든다.
+"""
+import os
+import re
+import time
+import threading
+import tempfile
+import logging
+from flask import current_app
+from .lru import ByteLRU
+
+logger = logging.getLogger(__name__)
+
+_memory = None
+_disk = None
+
+EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'image/avif': 'avif',
+}
+MIMETYPES = {ext: mimetype for mimetype, ext in EXTENSIONS.items()}
+
+_RENDITION_NAME = re.compile(r'^([0-9a-f]{16,64})_(\d+)x(\d+)_([a-z0-9]+)\.([a-z]+)$')
+
+
+class DiskRenditionCache:
+    """UPLOAD_FOLDER 아래 렌디션 파일 캐시 (용량 제한, 접근 시각 기준 LRU 삭제)"""
+
+    # 접근 시각(mtime) 갱신 최소 간격 - 조회마다 파일 시스템에 쓰지 않도록
+    TOUCH_INTERVAL = 60
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index = {}  # 키 -> [파일명, 크기, 마지막 접근 시각]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self.ready = False
+
+    @staticmethod
+    def make_key(image_hash, width, height, variant):
+        return f'{image_hash}_{width or 0}x{height or 0}_{variant}'
+
+    def start_scan(self):
+        """기존 파일로 인덱스 재구성 (백그라운드, 첫 요청을 막지 않음)"""
+        threading.Thread(target=self.scan, name='rendition-cache-scan', daemon=True).start()
+
+    def scan(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.directory):
+                if not entry.is_file():
+                    continue
+                match = _RENDITION_NAME.match(entry.name)
+                if not match:
+                    # 중단된 쓰기의 임시 파일 등 정리
+                    if entry.name.startswith('.tmp'):
+                        self._unlink(entry.path)
+                    continue
+                stat = entry.stat()
+                key = self.make_key(*match.group(1, 2, 3, 4))
+                entries.append((key, entry.name, stat.st_size, stat.st_mtime))
+            with self._lock:
+                for key, name, size, mtime in entries:
+                    if key not in self._index:
+                        self._index[key] = [name, size, mtime]
+                        self._bytes += size
+            self._evict()
+            logger.info(f"렌디션 캐시 인덱스 재구성: {len(entries)}개 파일")
+        except Exception as e:
+            logger.warning(f"렌디션 캐시 스캔 실패: {str(e)}")
+        finally:
+            self.ready = True
+
+    def get(self, key):
+        """(바이트, MIME 타입) 또는 None"""
+        with self._lock:
+            item = self._index.get(key)
+        if item is None:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        name, size, accessed = item
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                if self._index.pop(key, None):
+                    self._bytes -= size
+                self._stats['misses'] += 1
+            return None
+        now = time.time()
+        if now - accessed > self.TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+            item[2] = now
+        with self._lock:
+            self._stats['hits'] += 1
+        return data, MIMETYPES.get(name.rsplit('.', 1)[-1], 'image/jpeg')
+
+    def set(self, key, data, mimetype):
+        ext = EXTENSIONS.get(mimetype)
+        if not ext or len(data) > self.max_bytes:
+            return
+        name = f'{key}.{ext}'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.tmp', dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except OSError as e:
+            logger.warning(f"렌디션 캐시 쓰기 실패: {str(e)}")
+            return
+        with self._lock:
+            old = self._index.get(key)
+            if old:
+                self._bytes -= old[1]
+            self._index[key] = [name, len(data), time.time()]
+            self._bytes += len(data)
+            self._stats['writes'] += 1
+        self._evict()
+
+    def discard_hash(self, image_hash):
+        """원본 해시 하나의 모든 렌디션 파일 삭제"""
+        if not self.ready:
+            # 시작 직후(CLI 등) 인덱스가 아직 없으면 먼저 재구성해야 파일을 찾을 수 있음
+            self.scan()
+        prefix = f'{image_hash}_'
+        with self._lock:
+            keys = [k for k in self._index if k.startswith(prefix)]
+            items = [self._index.pop(k) for k in keys]
+            self._bytes -= sum(item[1] for item in items)
+        for name, _, _ in items:
+            self._unlink(os.path.join(self.directory, name))
+
+    def _evict(self):
+        with self._lock:
+            if self._bytes <= self.max_bytes:
+                return
+            victims = []
+            for key, item in sorted(self._index.items(), key=lambda kv: kv[1][2]):
+                if self._bytes <= self.max_bytes:
+                    break
+                del self._index[key]
+                self._bytes -= item[1]
+                victims.append(item[0])
+                self._stats['evictions'] += 1
+        for name in victims:
+            self._unlink(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._index), bytes=self._bytes,
+                        max_bytes=self.max_bytes, ready=self.ready)
+
+
+def init_app(app):
+    """디스크 렌디션 캐시 생성 및 인덱스 재구성 시작"""
+    global _disk
+    max_mb = app.config.get('RENDITION_CACHE_MAX_MB', 256)
+    if not max_mb or not app.config.get('UPLOAD_FOLDER'):
+        return
+    _disk = DiskRenditionCache(
+        os.path.join(app.config['UPLOAD_FOLDER'], 'renditions'),
+        int(max_mb * 1024 * 1024),
+    )
+    _disk.start_scan()
+
+
+def get_rendition(image_hash, width, height, variant):
+    """디스크에 저장된 렌디션 (바이트, MIME 타입) 또는 None"""
+    if _disk is None or not image_hash:
+        return None
+    return _disk.get(_disk.make_key(image_hash, width, height, variant))
+
+
+def set_rendition(image_hash, width, height, variant, image_bytes, mimetype):
+    if _disk is None or not image_hash:
+        return
+    _disk.set(_disk.make_key(image_hash, width, height, variant), image_bytes, mimetype)
+
+
+def discard_renditions(image_hash):
+    if _disk is not None and image_hash:
+        _disk.discard_hash(image_hash)
+
+
+def discard_renditions_async(image_hashes):
+    """여러 원본의 렌디션 파일 삭제를 백그라운드에서 처리 (삭제 요청 응답을 막지 않음)"""
+    image_hashes = [h for h in image_hashes if h]
+    if _disk is None or not image_hashes:
+        return
+
+    def run():
+        for image_hash in image_hashes:
+            try:
+                _disk.discard_hash(image_hash)
+            except Exception as e:
+                logger.warning(f"렌디션 삭제 실패 ({image_hash}): {str(e)}")
+
+    threading.Thread(target=run, name='rendition-discard', daemon=True).start()
+
+
+def content_hash(image_bytes):
+    """원본 이미지 내용 해시 (렌디션 파일명에 사용)"""
+    import hashlib
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def _memory_tier():
+    global _memory
+    if _memory is None:
+        config = current_app.config
+        _memory = ByteLRU(
+            max_bytes=int(config.get('IMAGE_CACHE_MAX_MB', 64) * 1024 * 1024),
+            max_entry_bytes=int(config.get('IMAGE_CACHE_MAX_ENTRY_MB', 4) * 1024 * 1024),
+            ttl=config.get('IMAGE_CACHE_TTL', 60),
+        )
+    return _memory
+
+
+def rendition_key(kind, object_id, width=None, height=None, fmt='jpeg'):
+    """이미지 렌디션 키 (예: 'post:12:1500x0:avif', 'post_image:3:0x0:webp')"""
+    return f'{kind}:{object_id}:{width or 0}x{height or 0}:{fmt}'
+
+
+def get(key):
+    """(바이트, MIME 타입, ETag) 또는 None"""
+    return _memory_tier().get(key)
+
+
+def set(key, image_bytes, mimetype, etag):
+    _memory_tier().set(key, (image_bytes, mimetype, etag), size=len(image_bytes))
+
+
+def invalidate_post(post_id, image_ids=()):
+    """게시글 대표 이미지의 모든 렌디션과 추가 이미지 항목 삭제 (post_id가 None이면 추가 이미지만)"""
+    memory = _memory_tier()
+    if post_id is not None:
+        memory.delete_prefix(f'post:{post_id}:')
+    for image_id in image_ids:
+        memory.delete_prefix(f'post_image:{image_id}:')
+
+
+def stats():
+    return {
+        'memory': _memory.stats() if _memory is not None else None,
+        'disk': _disk.stats() if _disk is not None else None,
+    }
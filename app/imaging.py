@@ -0,0 +1,309 @@
+"""
+이미지 리사이즈 엔진 (save_picture / get_image 공용)
+
+원본(최대 16MB 업로드)을 원래 해상도로 모두 디코딩한 뒤 LANCZOS로 줄이는 대신
+  1) JPEG는 Image.draft()로 디코딩 단계에서 1/2, 1/4, 1/8 크기로 바로 읽고 (DCT 스케일링)
+  2) 남은 배율이 크면 Image.reduce()로 정수 배 축소한 뒤
+  3) 마지막에만 LANCZOS로 정확한 크기를 맞춘다.
+디코딩 전에 픽셀 수를 확인해 IMAGE_MAX_PIXELS를 넘는 이미지는 거부한다.
+EXIF 방향(Orientation) 태그는 축소 후 픽셀에 적용하므로 메타데이터 없이 저장해도 방향이 유지된다.
+
+출력 포맷은 Accept 헤더로 AVIF → WebP → 프로그레시브 JPEG 순서로 고르고,
+포맷과 크기 구간(작은 썸네일/중간/큰 상세 이미지)별로 조정한 인코더 설정을 사용한다.
+"""
+import io
+import threading
+
+# reduce() 후에도 최종 크기의 이 배수 이상을 남겨 LANCZOS 품질 유지
+REDUCING_GAP = 2
+
+DEFAULT_MAX_PIXELS = 64 * 1024 * 1024
+
+# EXIF Orientation 태그
+ORIENTATION_TAG = 0x0112
+
+
+def fit_size(size, max_width=None, max_height=None):
+    """비율을 유지하며 (max_width, max_height) 안에 들어가는 크기 계산
+
+    한 쪽만 지정하면 그 쪽에 맞춘다. 원본보다 커지는 경우(확대)는 None 반환.
+    """
+    orig_w, orig_h = size
+    if not max_width and not max_height:
+        return None
+    if max_width and max_height:
+        ratio = min(max_width / orig_w, max_height / orig_h)
+    elif max_width:
+        ratio = max_width / orig_w
+    else:
+        ratio = max_height / orig_h
+    if ratio >= 1.0:
+        return None
+    return max(1, int(orig_w * ratio)), max(1, int(orig_h * ratio))
+
+
+def open_image(source, max_pixels=None):
+    """이미지 열기 (헤더만 읽음 - 픽셀 디코딩은 아직 하지 않음)
+
+    Args:
+        source: bytes 또는 파일 객체
+        max_pixels: 허용할 최대 픽셀 수 (넘으면 ValueError)
+    """
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    img = Image.open(source)
+    limit = max_pixels or DEFAULT_MAX_PIXELS
+    if img.width * img.height > limit:
+        raise ValueError(f'Image too large: {img.width}x{img.height} (limit {limit} pixels)')
+    return img
+
+
+def image_size(source):
+    """표시 크기 (헤더만 읽음, EXIF 방향 반영). 읽을 수 없으면 (None, None)"""
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    try:
+        with Image.open(source) as img:
+            width, height = img.size
+            if exif_orientation(img) in (5, 6, 7, 8):
+                return height, width
+            return width, height
+    except Exception:
+        return None, None
+
+
+def exif_orientation(img):
+    """EXIF 방향 값 (1~8, 없으면 1)"""
+    try:
+        return img.getexif().get(ORIENTATION_TAG, 1) or 1
+    except Exception:
+        return 1
+
+
+def apply_orientation(img, orientation):
+    """EXIF 방향 값을 픽셀에 적용 (ImageOps.exif_transpose와 같은 변환)"""
+    from PIL import Image
+
+    method = {
+        2: Image.Transpose.FLIP_LEFT_RIGHT,
+        3: Image.Transpose.ROTATE_180,
+        4: Image.Transpose.FLIP_TOP_BOTTOM,
+        5: Image.Transpose.TRANSPOSE,
+        6: Image.Transpose.ROTATE_270,
+        7: Image.Transpose.TRANSVERSE,
+        8: Image.Transpose.ROTATE_90,
+    }.get(orientation)
+    return img.transpose(method) if method is not None else img
+
+
+def placeholder(source, max_side=16, max_pixels=None):
+    """저화질 미리보기(LQIP)와 대표 색 계산
+
+    긴 변 max_side px 이하로 줄인 WebP를 data URI로 만들고 (보통 200~600 바이트),
+    평균 색을 '#rrggbb'로 반환한다. 이미지 로딩 전 배경으로 인라인해 사용한다.
+
+    Returns:
+        (data URI, 대표 색)
+    """
+    import base64
+    from PIL import Image
+
+    img, _ = load_resized(source, max_side, max_side, max_pixels)
+    img = flatten_alpha(img)
+    output = io.BytesIO()
+    img.save(output, format='WEBP', quality=30, method=4)
+    data_uri = 'data:image/webp;base64,' + base64.b64encode(output.getvalue()).decode('ascii')
+    red, green, blue = img.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+    return data_uri, f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def resample(img, size):
+    """reduce()로 정수 배 축소 후 LANCZOS로 최종 크기 맞춤"""
+    from PIL import Image
+
+    target_w, target_h = size
+    factor = min(img.width // (target_w * REDUCING_GAP), img.height // (target_h * REDUCING_GAP))
+    if factor >= 2:
+        img = img.reduce(factor)
+    if img.size != (target_w, target_h):
+        img = img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+    return img
+
+
+def load_resized(source, max_width=None, max_height=None, max_pixels=None):
+    """원본을 열어 (max_width, max_height) 안으로 축소한 이미지 반환
+
+    Args:
+        source: bytes, 파일 객체 또는 open_image()로 이미 연 이미지
+
+    Returns:
+        (PIL Image, 원본 포맷 - 'JPEG', 'PNG' 등)
+    """
+    from PIL import Image
+
+    img = source if isinstance(source, Image.Image) else open_image(source, max_pixels)
+    source_format = img.format
+    orientation = exif_orientation(img)
+    if orientation in (5, 6, 7, 8):
+        # 90도 회전된 이미지는 저장된 픽셀 기준으로 가로/세로 제한을 바꿔 적용
+        max_width, max_height = max_height, max_width
+    target = fit_size(img.size, max_width, max_height)
+    if target is not None:
+        if source_format == 'JPEG':
+            # 디코딩 단계에서 목표 크기 이상인 가장 작은 배율(1/2, 1/4, 1/8)로 읽음
+            img.draft(img.mode, target)
+        img = resample(img, target)
+    return apply_orientation(img, orientation), source_format
+
+
+def flatten_alpha(img, background=(255, 255, 255)):
+    """알파 채널/팔레트 이미지를 흰 배경 RGB로 합성 (JPEG 저장용)"""
+    from PIL import Image
+
+    if img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        rgb_img = Image.new('RGB', img.size, background)
+        rgb_img.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+        return rgb_img
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+# 크기 구간 (긴 변 기준 px) - 작은 이미지일수록 압축 흔적이 잘 보이므로 품질을 높게
+SIZE_CLASSES = [(480, 'small'), (1280, 'medium'), (None, 'large')]
+
+# 포맷/크기 구간별 인코더 설정 (WebP method=6은 느리고 이득이 작아 4 사용)
+ENCODER_PRESETS = {
+    'avif': {
+        'small': {'quality': 62, 'speed': 6},
+        'medium': {'quality': 56, 'speed': 6},
+        'large': {'quality': 50, 'speed': 7},
+    },
+    'webp': {
+        'small': {'quality': 82, 'method': 4},
+        'medium': {'quality': 80, 'method': 4},
+        'large': {'quality': 76, 'method': 4},
+    },
+    'jpeg': {
+        'small': {'quality': 85, 'optimize': True, 'progressive': True},
+        'medium': {'quality': 82, 'optimize': True, 'progressive': True},
+        'large': {'quality': 80, 'optimize': True, 'progressive': True},
+    },
+}
+
+FORMAT_MIMETYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+PIL_FORMATS = {'avif': 'AVIF', 'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+_stats = {}
+_stats_lock = threading.Lock()
+_avif_supported = None
+
+
+def avif_supported():
+    """Pillow에 AVIF 인코더가 포함되어 있는지 확인 (Pillow 11.2+ 또는 pillow-avif-plugin)"""
+    global _avif_supported
+    if _avif_supported is None:
+        try:
+            from PIL import features
+            _avif_supported = bool(features.check('avif'))
+        except Exception:
+            _avif_supported = False
+    return _avif_supported
+
+
+def negotiate_format(accept_mimetypes, allow_avif=True):
+    """Accept 헤더로 출력 포맷 선택 ('avif', 'webp', 'jpeg')
+
+    Args:
+        accept_mimetypes: request.accept_mimetypes
+
+    AVIF/WebP는 브라우저가 직접 나열한 경우만 사용하고 (*/*만 보내면 JPEG),
+    q=0으로 거부한 형식은 제외한다. q 값이 같으면 AVIF → WebP → JPEG 순서.
+    """
+    listed = {value.lower(): quality for value, quality in accept_mimetypes or ()}
+    best, best_quality = 'jpeg', 0
+    for fmt in ('avif', 'webp'):
+        if fmt == 'avif' and not (allow_avif and avif_supported()):
+            continue
+        quality = listed.get(FORMAT_MIMETYPES[fmt], 0)
+        if quality > best_quality:
+            best, best_quality = fmt, quality
+    if accept_mimetypes and accept_mimetypes.quality('image/jpeg') > best_quality:
+        return 'jpeg'
+    return best
+
+
+def size_class(size):
+    longest = max(size)
+    for limit, name in SIZE_CLASSES:
+        if limit is None or longest <= limit:
+            return name
+    return 'large'
+
+
+def encode(img, fmt):
+    """포맷/크기 구간별 설정으로 인코딩. (바이트, MIME 타입) 반환"""
+    if fmt == 'jpeg':
+        img = flatten_alpha(img)
+    elif img.mode not in ('RGB', 'RGBA'):
+        # WebP/AVIF는 알파 채널 지원 - 팔레트/흑백 등은 RGB(A)로 변환
+        img = img.convert('RGBA' if 'A' in img.getbands() or img.mode == 'P' else 'RGB')
+    options = ENCODER_PRESETS[fmt][size_class(img.size)]
+    output = io.BytesIO()
+    img.save(output, format=PIL_FORMATS[fmt], **options)
+    return output.getvalue(), FORMAT_MIMETYPES[fmt]
+
+
+def render(source, fmt, max_width=None, max_height=None, max_pixels=None):
+    """원본 바이트를 축소 + 포맷 변환한 렌디션 생성. (바이트, MIME 타입) 반환"""
+    img, _ = load_resized(source, max_width, max_height, max_pixels)
+    image_bytes, mimetype = encode(img, fmt)
+    record_encoded(fmt, len(source), len(image_bytes))
+    return image_bytes, mimetype
+
+
+def recompress(source, max_width=None, max_height=None, max_pixels=None, quality=85):
+    """저장된 원본을 메타데이터 없는 프로그레시브 JPEG로 다시 압축 (일괄 재압축 작업용)
+
+    EXIF 방향을 픽셀에 적용하고 (max_width, max_height)를 넘으면 축소한다.
+    애니메이션 이미지는 JPEG로 바꾸면 움직임이 사라지므로 None 반환.
+    """
+    # 축소/회전한 이미지는 첫 프레임만 남으므로 애니메이션 여부는 연 직후에 확인
+    img = open_image(source, max_pixels)
+    if getattr(img, 'is_animated', False):
+        return None
+    img, _ = load_resized(img, max_width, max_height)
+    # 색 프로파일은 유지하고 (광색역 사진의 색 보존) EXIF/XMP 등 나머지 메타데이터는 저장하지 않음
+    icc_profile = img.info.get('icc_profile')
+    img = flatten_alpha(img)
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=quality, optimize=True, progressive=True,
+             icc_profile=icc_profile)
+    return output.getvalue()
+
+
+def record_encoded(fmt, source_bytes, output_bytes):
+    """포맷별 인코딩 통계
+
+    source_bytes는 저장된 원본 전체 크기이므로 절감량(saved_vs_original_bytes)에는
+    포맷 변환 효과와 축소(?w=) 효과가 함께 들어 있다 (같은 크기 JPEG 대비 절감량이 아님).
+    """
+    with _stats_lock:
+        item = _stats.setdefault(fmt, {'encoded': 0, 'source_bytes': 0, 'output_bytes': 0})
+        item['encoded'] += 1
+        item['source_bytes'] += source_bytes
+        item['output_bytes'] += output_bytes
+
+
+def stats():
+    with _stats_lock:
+        return {
+            fmt: dict(item, saved_vs_original_bytes=item['source_bytes'] - item['output_bytes'])
+            for fmt, item in _stats.items()
+        }
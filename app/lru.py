@@ -0,0 +1,95 @@
+"""
+바이트 크기 제한 LRU 캐시 (프로세스 메모리)
+
+항목 수가 아니라 저장한 값의 바이트 크기 합계로 용량을 제한한다.
+페이지 캐시의 로컬 계층과 이미지 바이트 캐시에서 함께 사용한다.
+"""
+import time
+import threading
+from collections import OrderedDict
+
+
+class ByteLRU:
+    """바이트 크기 기준 LRU 캐시 (스레드 안전)
+
+    Args:
+        max_bytes: 전체 용량 (바이트). 0이면 캐시 비활성화
+        max_entry_bytes: 항목 하나의 최대 크기 (이보다 크면 저장하지 않음)
+        ttl: 항목 유효 시간 (초). None이면 만료 없음
+    """
+
+    def __init__(self, max_bytes, max_entry_bytes=None, ttl=None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'rejected': 0}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, key):
+        """값 반환 (없거나 만료되었으면 None)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._stats['misses'] += 1
+                return None
+            value, size, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                self._remove(key)
+                self._stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key, value, size=None):
+        """값 저장 (size를 생략하면 len(value) 사용)"""
+        if not self.enabled:
+            return False
+        size = len(value) if size is None else size
+        if size > self.max_entry_bytes:
+            with self._lock:
+                self._stats['rejected'] += 1
+            return False
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def delete_prefix(self, prefix):
+        """접두사가 같은 모든 항목 삭제 (예: 게시글 하나의 모든 렌디션)"""
+        with self._lock:
+            for key in [k for k in self._data if isinstance(k, str) and k.startswith(prefix)]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._data), bytes=self._bytes, max_bytes=self.max_bytes)
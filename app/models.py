@@ -1,6 +1,6 @@
 from datetime import datetime
 from flask_login import UserMixin
-from sqlalchemy import Index
+from sqlalchemy import Index, inspect
 from . import db
 import re
 from urllib.parse import quote, urlparse, parse_qs, unquote
@@ -30,6 +30,90 @@ class Setting(db.Model):
         db.session.commit()
         return setting
 
+class PostCounter(db.Model):
+    """게시글 수 카운터 (통계 API용)
+    
+    COUNT(*) 대신 글 작성/삭제/동기화 시 같은 트랜잭션 안에서 함께 갱신한다.
+    key 형식: 'total', 'category:<카테고리>', 'day:<YYYY-MM-DD>' (UTC 기준),
+    'generation:<카테고리>' (글이 바뀔 때마다 증가 - HTTP 캐시 검증자로 사용)
+    """
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    
+    @staticmethod
+    def keys_for(category, created_at=None):
+        """게시글 하나가 영향을 주는 카운터 키 목록"""
+        created_at = created_at or datetime.utcnow()
+        return ['total', f'category:{category}', f'day:{created_at.strftime("%Y-%m-%d")}']
+    
+    @staticmethod
+    def add(key, delta):
+        """카운터 증감 (커밋하지 않음 - 호출한 쪽의 트랜잭션에 포함)"""
+        from sqlalchemy import update
+        from sqlalchemy.exc import IntegrityError
+        result = db.session.execute(
+            update(PostCounter).where(PostCounter.key == key).values(value=PostCounter.value + delta)
+        )
+        if result.rowcount:
+            return
+        try:
+            # 새 키 (예: 오늘 첫 게시글) - 동시에 생성된 경우 다시 UPDATE
+            with db.session.begin_nested():
+                db.session.add(PostCounter(key=key, value=max(delta, 0)))
+        except IntegrityError:
+            db.session.execute(
+                update(PostCounter).where(PostCounter.key == key).values(value=PostCounter.value + delta)
+            )
+    
+    @staticmethod
+    def touch(*categories):
+        """카테고리 내용이 바뀌었음을 기록 (세대 번호 증가)"""
+        for category in set(categories):
+            PostCounter.add(f'generation:{category}', 1)
+    
+    @staticmethod
+    def record_created(category, created_at=None):
+        for key in PostCounter.keys_for(category, created_at):
+            PostCounter.add(key, 1)
+        PostCounter.touch(category)
+    
+    @staticmethod
+    def record_deleted(category, created_at=None):
+        for key in PostCounter.keys_for(category, created_at):
+            PostCounter.add(key, -1)
+        PostCounter.touch(category)
+    
+    @staticmethod
+    def record_moved(old_category, new_category):
+        """카테고리 변경 (전체/일별 수는 그대로)"""
+        if old_category != new_category:
+            PostCounter.add(f'category:{old_category}', -1)
+            PostCounter.add(f'category:{new_category}', 1)
+        PostCounter.touch(old_category, new_category)
+    
+    @staticmethod
+    def get_many(keys):
+        """여러 카운터를 한 번의 기본 키 조회로 가져오기 (없는 키는 0)"""
+        rows = PostCounter.query.filter(PostCounter.key.in_(list(keys))).all()
+        values = {row.key: row.value for row in rows}
+        return {key: values.get(key, 0) for key in keys}
+    
+    @staticmethod
+    def rebuild():
+        """Post 테이블에서 카운터 전체 재계산 (최초 실행/불일치 복구용, 커밋하지 않음)"""
+        from sqlalchemy import func
+        # 세대 번호는 유지 (재계산 후에도 이전 ETag와 겹치지 않도록)
+        PostCounter.query.filter(~PostCounter.key.like('generation:%')).delete(synchronize_session=False)
+        counters = {'total': db.session.query(func.count(Post.id)).scalar() or 0}
+        for category, count in db.session.query(Post.category, func.count(Post.id)).group_by(Post.category):
+            counters[f'category:{category}'] = count
+        for (created_at,) in db.session.query(Post.created_at):
+            if created_at:
+                day_key = f'day:{created_at.strftime("%Y-%m-%d")}'
+                counters[day_key] = counters.get(day_key, 0) + 1
+        for key, value in counters.items():
+            db.session.add(PostCounter(key=key, value=value))
+
 class User(UserMixin, db.Model):
     id = db.Column(db.String(100), primary_key=True) # Google ID
     email = db.Column(db.String(100), unique=True, nullable=False)
@@ -47,19 +131,31 @@ class User(UserMixin, db.Model):
 class PostImage(db.Model):
     """게시글에 포함된 추가 이미지"""
     id = db.Column(db.Integer, primary_key=True)
-    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id', ondelete='CASCADE'), nullable=False, index=True)
     image_data = db.Column(db.LargeBinary, nullable=False)
     image_mimetype = db.Column(db.String(50), nullable=False)
     order = db.Column(db.Integer, default=0) # 표시 순서
+    image_hash = db.Column(db.String(64), nullable=True) # image_data 내용 해시 (렌디션 캐시 파일명)
+    image_width = db.Column(db.Integer, nullable=True) # 원본 크기 (srcset / 레이아웃 이동 방지용)
+    image_height = db.Column(db.Integer, nullable=True)
+    image_placeholder = db.Column(db.Text, nullable=True) # 저화질 미리보기 (WebP data URI, 1KB 이하)
+    image_color = db.Column(db.String(7), nullable=True) # 대표 색 ('#rrggbb')
 
 class Post(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text)
+    content_html = db.Column(db.Text, nullable=True) # 저장 시 정리한 본문 HTML (이미지 srcset/지연 로드, app/content.py)
     image_filename = db.Column(db.String(100), nullable=True) # For gallery images (deprecated, use image_data)
     image_data = db.Column(db.LargeBinary, nullable=True) # 이미지 바이너리 데이터 (DB에 저장)
     image_mimetype = db.Column(db.String(50), nullable=True) # 이미지 MIME 타입 (예: 'image/jpeg', 'image/png')
     image_url = db.Column(db.String(500), nullable=True) # 외부 이미지 URL (티스토리 등)
+    image_hash = db.Column(db.String(64), nullable=True) # image_data 내용 해시 (렌디션 캐시 파일명)
+    image_width = db.Column(db.Integer, nullable=True) # image_data 크기 (srcset / 레이아웃 이동 방지용)
+    image_height = db.Column(db.Integer, nullable=True)
+    # 대표 이미지(image_data 또는 티스토리 image_url)의 저화질 미리보기 / 대표 색
+    image_placeholder = db.Column(db.Text, nullable=True)
+    image_color = db.Column(db.String(7), nullable=True)
     
     # Category: 'gallery', 'archive_tech', 'archive_daily' (example names for the two archive types)
     # User asked for "two types of archive". Let's name them 'archive_1', 'archive_2' for now or allow user to rename.
@@ -68,6 +164,7 @@ class Post(db.Model):
     
     user_id = db.Column(db.String(100), db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True) # 정적 내보내기 증분 판단용
     
     # 티스토리 연동용 필드
     tistory_post_id = db.Column(db.String(100), nullable=True, unique=True) # 티스토리 글 ID (중복 방지)
@@ -81,9 +178,19 @@ class Post(db.Model):
     # Eager loading을 위한 관계 설정
     author = db.relationship('User', backref=db.backref('posts', lazy='dynamic'))
     
-    # 추가 이미지 (1:N 관계)
-    images = db.relationship('PostImage', backref='post', cascade='all, delete-orphan', lazy=True)
+    # 추가 이미지 (1:N 관계) - 삭제는 DB의 ON DELETE CASCADE에 맡김 (이미지 데이터를 읽지 않도록)
+    images = db.relationship('PostImage', backref='post', cascade='all, delete-orphan',
+                             passive_deletes=True, lazy=True)
     
+    def has_db_image(self):
+        """Post.image_data에 이미지가 저장되어 있는지 (defer/load_only로 빠진 image_data는 읽지 않음)
+        
+        목록 렌더링 중 글마다 image_data를 지연 로드하지 않도록(N+1 쿼리 + 대용량 데이터) MIME 타입으로 먼저 판단한다.
+        """
+        if self.image_mimetype:
+            return True
+        return 'image_data' not in inspect(self).unloaded and self.image_data is not None
+
     def has_image_data(self):
         """이미지 데이터가 있는지 안전하게 체크 (이미지 데이터 로드 없이도 체크 가능)"""
         # image_url이 있으면 이미지 있음
@@ -95,9 +202,9 @@ class Post(db.Model):
         # image_mimetype이 있으면 이미지 데이터 있음 (로드되지 않았어도 판단 가능)
         if self.image_mimetype:
             return True
-        # image_data가 로드된 경우 체크
+        # image_data가 로드된 경우 체크 (defer/load_only로 빠진 경우 읽지 않음)
         try:
-            if hasattr(self, 'image_data') and self.image_data is not None:
+            if 'image_data' not in inspect(self).unloaded and self.image_data is not None:
                 try:
                     if len(self.image_data) > 0:
                         return True
@@ -161,6 +268,32 @@ class Post(db.Model):
         except Exception:
             return None
     
+    def get_image_size(self):
+        """get_image_url()이 DB 이미지를 가리킬 때 그 이미지의 (너비, 높이). 모르면 (None, None)"""
+        if self.image_url:
+            return None, None
+        if self.has_db_image():
+            return self.image_width, self.image_height
+        try:
+            if self.images and len(self.images) > 0:
+                first_image = sorted(self.images, key=lambda img: (img.order or 0, img.id))[0]
+                return first_image.image_width, first_image.image_height
+        except Exception:
+            pass
+        return None, None
+
+    def get_image_placeholder(self):
+        """get_image_url() 이미지의 (저화질 미리보기 data URI, 대표 색). 모르면 (None, None)"""
+        if self.image_placeholder or self.image_color or self.image_url or self.image_mimetype:
+            return self.image_placeholder, self.image_color
+        try:
+            if self.images and len(self.images) > 0:
+                first_image = sorted(self.images, key=lambda img: (img.order or 0, img.id))[0]
+                return first_image.image_placeholder, first_image.image_color
+        except Exception:
+            pass
+        return None, None
+
     def get_image_url(self, use_thumbnail=True, thumbnail_size='160x108'):
         """대표 이미지 URL 반환
         
@@ -190,7 +323,7 @@ class Post(db.Model):
                 return self.image_url
 
         # 2) Post 자체에 DB 이미지가 있으면 /image/<post_id> 사용
-        if self.image_mimetype or self.image_data:
+        if self.has_db_image():
             return url_for('main.get_image', post_id=self.id)
 
         # 3) PostImage에 추가 이미지가 있으면 첫 번째 이미지를 대표로 사용
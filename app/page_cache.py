@@ -0,0 +1,210 @@
+"""
+목록 페이지 캐시 (stale-while-revalidate + 요청 병합)
+
+gallery()/archive()의 렌더링 결과를 캐시에 저장할 때 소프트/하드 TTL을 둔다.
+  - 소프트 TTL 이내이고 ETag(카테고리 세대 번호)가 같으면 그대로 사용
+  - 소프트 TTL이 지났거나 글이 바뀌어 세대 번호가 달라졌으면 '오래된 항목'으로 보고,
+    캐시 임대(lease) 키를 얻은 요청 하나만 다시 렌더링하고 나머지는 오래된 항목을 반환
+  - 하드 TTL이 지나 항목이 아예 없으면 임대를 얻은 요청이 렌더링하고,
+    나머지는 잠시 기다렸다가 그 결과를 함께 사용 (thundering herd 방지)
+
+각 항목은 렌더링 당시의 ETag를 함께 저장하므로 오래된 본문에 새 ETag가 붙지 않는다.
+
+공유 캐시(Flask-Caching 백엔드) 앞에는 프로세스 메모리 LRU 계층을 둔다.
+로컬 계층은 짧은 TTL(PAGE_CACHE_LOCAL_TTL)과 바이트 용량 제한을 가지며,
+ETag(세대 번호)가 현재 값과 다르면 사용하지 않으므로 글 변경이 바로 반영된다.
+
+get_or_stream()은 스트리밍 렌더링용이다. 캐시 항목은 렌더링된 조각(chunk) 목록으로 저장하고,
+다시 렌더링할 때는 조각을 클라이언트에 바로 보내면서 모아 두었다가 끝까지 보낸 뒤 저장한다.
+"""
+import time
+import threading
+import logging
+from flask import current_app
+from . import cache
+from .lru import ByteLRU
+
+logger = logging.getLogger(__name__)
+
+_stats = {
+    'fresh': 0,        # 최신 항목 그대로 반환
+    'stale': 0,        # 다른 요청이 갱신 중이라 오래된 항목 반환
+    'coalesced': 0,    # 항목이 없어 기다렸다가 다른 요청의 결과 사용
+    'recomputed': 0,   # 직접 렌더링
+    'shared_hits': 0,  # 공유 캐시 조회 성공
+    'shared_misses': 0,
+}
+_stats_lock = threading.Lock()
+
+_local = None
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _local_tier():
+    """프로세스 메모리 계층 (설정값으로 최초 사용 시 생성)"""
+    global _local
+    if _local is None:
+        config = current_app.config
+        _local = ByteLRU(
+            max_bytes=config.get('PAGE_CACHE_LOCAL_MAX_BYTES', 0),
+            max_entry_bytes=config.get('PAGE_CACHE_LOCAL_MAX_ENTRY_BYTES'),
+            ttl=config.get('PAGE_CACHE_LOCAL_TTL', 10),
+        )
+    return _local
+
+
+def stats():
+    """캐시 통계 (워커 프로세스 단위, 계층별)"""
+    with _stats_lock:
+        result = dict(_stats)
+    result['local'] = _local.stats() if _local is not None else None
+    return result
+
+
+def _entry_size(entry):
+    value = entry['value']
+    if isinstance(value, list):
+        return sum(len(chunk.encode('utf-8')) for chunk in value)
+    return len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+
+
+def _store(key, value, etag):
+    config = current_app.config
+    entry = {
+        'value': value,
+        'etag': etag,
+        'fresh_until': time.time() + config.get('PAGE_CACHE_SOFT_TTL', 120),
+    }
+    cache.set(key, entry, timeout=config.get('PAGE_CACHE_HARD_TTL', 600))
+    _local_tier().set(key, entry, size=_entry_size(entry))
+
+
+def _get_entry(key, etag):
+    """로컬 계층 → 공유 캐시 순서로 항목 조회
+
+    로컬 항목은 ETag가 현재 값과 같을 때만 사용한다 (세대 번호 기반 무효화).
+    """
+    local = _local_tier()
+    entry = local.get(key)
+    if entry is not None:
+        if entry['etag'] == etag:
+            return entry
+        local.delete(key)
+
+    entry = cache.get(key)
+    if entry is None:
+        _count('shared_misses')
+        return None
+    _count('shared_hits')
+    if entry['etag'] == etag:
+        local.set(key, entry, size=_entry_size(entry))
+    return entry
+
+
+def _recompute(key, etag, render):
+    value = render()
+    _store(key, value, etag)
+    _count('recomputed')
+    return value
+
+
+def _resolve(key, etag, lock_key):
+    """캐시 항목 조회 + 갱신 임대 처리
+
+    Returns:
+        (항목, 임대 여부) - 항목이 None이면 호출자가 렌더링해야 하며,
+        임대를 얻었으면 렌더링 후 lock_key를 삭제해야 한다.
+    """
+    config = current_app.config
+    lock_ttl = config.get('PAGE_CACHE_LOCK_TTL', 30)
+
+    entry = _get_entry(key, etag)
+    if entry is not None:
+        if entry['etag'] == etag and time.time() < entry['fresh_until']:
+            _count('fresh')
+            return entry, False
+
+        # 오래된 항목 - 임대를 얻은 요청 하나만 갱신
+        if cache.add(lock_key, 1, timeout=lock_ttl):
+            return None, True
+        _count('stale')
+        return entry, False
+
+    # 항목 없음 - 다른 요청이 렌더링 중이면 잠시 기다림
+    if not cache.add(lock_key, 1, timeout=lock_ttl):
+        deadline = time.time() + config.get('PAGE_CACHE_WAIT_TIMEOUT', 2.0)
+        while time.time() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                _count('coalesced')
+                return entry, False
+        # 기다려도 결과가 없으면 직접 렌더링 (임대 없이)
+        return None, False
+    return None, True
+
+
+def get_or_render(key, etag, render):
+    """캐시된 페이지를 반환하거나 render()로 새로 만들어 저장
+
+    Args:
+        key: 캐시 키 (예: 'gallery_posts_page_1')
+        etag: 현재 ETag (listing_etag 결과 - 세대 번호가 바뀌면 달라짐)
+        render: 페이지를 렌더링하는 함수
+
+    Returns:
+        (본문, 본문의 ETag) 튜플
+    """
+    lock_key = f'{key}:lock'
+    entry, lease = _resolve(key, etag, lock_key)
+    if entry is not None:
+        return entry['value'], entry['etag']
+    try:
+        return _recompute(key, etag, render), etag
+    finally:
+        if lease:
+            cache.delete(lock_key)
+
+
+def _stream_and_store(key, etag, chunks, lock_key, lease):
+    """조각을 그대로 내보내면서 모아 두었다가 끝까지 렌더링되면 저장"""
+    rendered = []
+    try:
+        for chunk in chunks:
+            rendered.append(chunk)
+            yield chunk
+        # 클라이언트가 중간에 끊으면(GeneratorExit) 일부만 렌더링된 결과는 저장하지 않음
+        _store(key, rendered, etag)
+        _count('recomputed')
+    finally:
+        if lease:
+            cache.delete(lock_key)
+
+
+def get_or_stream(key, etag, render):
+    """get_or_render()의 스트리밍 버전
+
+    Args:
+        render: 렌더링된 HTML 조각을 순서대로 내보내는 이터러블을 반환하는 함수
+            (DB 조회는 render() 호출 중에 끝내고, 템플릿 렌더링은 순회할 때 진행)
+
+    Returns:
+        (조각 이터러블, 본문의 ETag) 튜플 - 캐시된 항목이면 조각 목록(list),
+        새로 렌더링하면 요청 컨텍스트 안에서 순회해야 하는 제너레이터 (stream_with_context)
+    """
+    lock_key = f'{key}:lock'
+    entry, lease = _resolve(key, etag, lock_key)
+    if entry is not None:
+        value = entry['value']
+        return (value if isinstance(value, list) else [value]), entry['etag']
+    try:
+        chunks = render()
+    except Exception:
+        if lease:
+            cache.delete(lock_key)
+        raise
+    return _stream_and_store(key, etag, chunks, lock_key, lease), etag
@@ -0,0 +1,113 @@
+"""
+저장된 이미지 일괄 재압축 (flask --app index recompress-images)
+
+Post.image_data / PostImage.image_data 를 id 순서로 chunk_size개씩 읽어
+  1) 프로세스 풀에서 EXIF 방향 적용 + 메타데이터 제거 + 프로그레시브 JPEG 재압축을 하고
+  2) 결과가 원본보다 작을 때만 교체한다 (해시/크기/미리보기 컬럼도 다시 계산).
+교체하지 않은 행도 image_hash 등이 비어 있으면 채운다.
+
+청크마다 마지막 id를 Setting('recompress_last_id:<테이블>')에 저장하므로
+중단되어도 다시 실행하면 이어서 처리한다 (--restart로 처음부터).
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'recompress_last_id:{}'
+
+
+def _recompress_job(job):
+    """프로세스 풀 작업 (앱 컨텍스트 없이 실행)"""
+    from .imaging import recompress
+
+    object_id, source, max_width, max_height, max_pixels, quality = job
+    result = {'id': object_id, 'source_bytes': len(source), 'image_data': None, 'error': None}
+    try:
+        candidate = recompress(source, max_width, max_height, max_pixels, quality)
+        if candidate is not None and len(candidate) < len(source):
+            result['image_data'] = candidate
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def _targets():
+    """(모델, 진행 키 이름, 최대 크기) - 크기는 save_picture에서 쓰는 값과 같게"""
+    from .models import Post, PostImage
+    return [
+        (Post, 'post', (800, 1200)),
+        (PostImage, 'post_image', (2500, 2500)),
+    ]
+
+
+def recompress_library(app, chunk_size=20, workers=None, quality=85, dry_run=False, restart=False,
+                       echo=logger.info):
+    """이미지 라이브러리 재압축
+
+    Returns:
+        {'scanned': 처리한 행 수, 'replaced': 교체한 수, 'failed': 실패 수,
+         'backfilled': 해시 등만 채운 수, 'bytes_reclaimed': 줄어든 바이트}
+    """
+    from . import db, image_cache
+    from .models import Setting
+    from .routes import image_columns
+
+    totals = {'scanned': 0, 'replaced': 0, 'failed': 0, 'backfilled': 0, 'bytes_reclaimed': 0}
+    max_pixels = app.config.get('IMAGE_MAX_PIXELS')
+    workers = workers or os.cpu_count() or 1
+
+    with app.app_context(), ProcessPoolExecutor(max_workers=workers) as pool:
+        for model, name, (max_width, max_height) in _targets():
+            progress_key = PROGRESS_KEY.format(name)
+            # --restart는 미리보기(dry_run)에서도 처음부터 (저장된 진행 위치는 실제 실행에서만 초기화)
+            last_id = 0 if restart else int(Setting.get(progress_key) or 0)
+            if restart and not dry_run:
+                Setting.set(progress_key, '0')
+            echo(f'{name}: id {last_id} 다음부터 처리')
+
+            while True:
+                rows = db.session.query(model.id, model.image_data, model.image_hash).filter(
+                    model.id > last_id, model.image_data.isnot(None)
+                ).order_by(model.id).limit(chunk_size).all()
+                if not rows:
+                    break
+
+                sources = {row.id: bytes(row.image_data) for row in rows}
+                hashes = {row.id: row.image_hash for row in rows}
+                jobs = [(row.id, sources[row.id], max_width, max_height, max_pixels, quality) for row in rows]
+                old_hashes = []
+                for result in pool.map(_recompress_job, jobs):
+                    row_id = result['id']
+                    totals['scanned'] += 1
+                    row_hash = hashes[row_id]
+                    if result['error']:
+                        totals['failed'] += 1
+                        echo(f"{name} {row_id}: 재압축 실패 ({result['error']})")
+                    if result['image_data'] is not None:
+                        saved = result['source_bytes'] - len(result['image_data'])
+                        totals['replaced'] += 1
+                        totals['bytes_reclaimed'] += saved
+                        values = dict(image_columns(result['image_data']),
+                                      image_data=result['image_data'], image_mimetype='image/jpeg')
+                        old_hashes.append(row_hash)
+                    elif not row_hash:
+                        totals['backfilled'] += 1
+                        values = image_columns(sources[row_id])
+                    else:
+                        continue
+                    if not dry_run:
+                        model.query.filter_by(id=row_id).update(values, synchronize_session=False)
+
+                last_id = rows[-1].id
+                if dry_run:
+                    db.session.rollback()
+                else:
+                    # 교체 내용과 진행 위치를 같은 트랜잭션으로 커밋
+                    Setting.set(progress_key, str(last_id))
+                    for old_hash in old_hashes:
+                        image_cache.discard_renditions(old_hash)
+                echo(f"{name}: id {last_id}까지 처리 (누적 {totals['bytes_reclaimed'] / 1024 / 1024:.1f} MB 절감)")
+
+    return totals
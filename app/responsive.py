@@ -0,0 +1,102 @@
+"""
+반응형 이미지 템플릿 헬퍼 (srcset / sizes)
+
+템플릿에서 {{ responsive_img(url, width, height, sizes=..., alt=...) }} 형태로 사용한다.
+  - /image/<id>, /post/image/<id> (렌디션 라우트) URL이면 ?w= 너비별 srcset을 만들어
+    브라우저가 화면 크기/DPR에 맞는 렌디션만 받게 한다. 원본보다 큰 너비는 넣지 않는다.
+  - 업로드 시 저장한 원본 크기(width/height)를 속성으로 넣어 레이아웃 이동(CLS)을 막는다.
+  - 화면 아래쪽 이미지는 loading="lazy" decoding="async", 첫 화면 이미지는 즉시 로드한다.
+  - 업로드 시 계산한 저화질 미리보기(LQIP)와 대표 색을 배경으로 인라인해
+    추가 요청 없이 이미지가 도착하기 전까지 흐린 미리보기를 보여준다.
+외부 URL(티스토리 썸네일 등)은 srcset 없이 src와 로딩 속성만 붙인다.
+"""
+from markupsafe import Markup, escape
+
+# srcset 너비 단계 (렌디션 캐시 항목 수를 제한하기 위해 고정된 값만 사용)
+DEFAULT_WIDTHS = [320, 640, 960, 1280, 1600, 2400]
+
+# 템플릿에서 쓰는 sizes 값 (실제 CSS 표시 폭 기준)
+#   - 목록 썸네일: .gallery-thumbnail-img가 화면 크기와 관계없이 160x108 고정 (base.css)
+#   - 상세 이미지: .main-content max-width 1200px 안에서 mw-100 (그보다 좁은 화면은 화면 폭)
+THUMBNAIL_SIZES = '160px'
+DETAIL_SIZES = '(max-width: 1200px) 100vw, 1200px'
+
+RENDITION_PREFIXES = ('/image/', '/post/image/')
+
+
+def rendition_widths(intrinsic_width=None, widths=None):
+    """srcset에 넣을 너비 목록 (원본보다 큰 단계는 원본 너비 하나로 대체)"""
+    widths = sorted(widths or DEFAULT_WIDTHS)
+    if not intrinsic_width:
+        return widths
+    result = [w for w in widths if w < intrinsic_width]
+    if intrinsic_width <= widths[-1]:
+        result.append(intrinsic_width)
+    return result
+
+
+def srcset(url, intrinsic_width=None, widths=None):
+    """렌디션 URL의 srcset 값 (렌디션 라우트가 아니면 None)"""
+    if not url or not url.startswith(RENDITION_PREFIXES) or '?' in url:
+        return None
+    return ', '.join(f'{url}?w={w} {w}w' for w in rendition_widths(intrinsic_width, widths))
+
+
+def placeholder_style(placeholder=None, color=None):
+    """미리보기 배경 CSS (이미지가 그려지면 가려짐)"""
+    rules = []
+    if color:
+        rules.append(f'background-color: {color}')
+    if placeholder:
+        rules.append(f"background-image: url('{placeholder}'); background-size: cover; background-position: center")
+    return '; '.join(rules)
+
+
+def responsive_img(url, width=None, height=None, sizes='100vw', lazy=True,
+                   default_width=640, widths=None, placeholder=None, color=None, **attrs):
+    """<img> 태그 생성
+
+    Args:
+        url: 이미지 URL (post.get_image_url() 등)
+        width, height: 원본 크기 (모르면 None - 크기 속성 생략)
+        sizes: 화면 폭별 표시 크기 (THUMBNAIL_SIZES, DETAIL_SIZES 등)
+        lazy: True면 지연 로드 (첫 화면 밖 이미지), False면 즉시 로드
+        default_width: srcset을 지원하지 않는 브라우저용 src 너비
+        placeholder, color: 저화질 미리보기 data URI / 대표 색 (get_image_placeholder())
+        **attrs: class, alt, style 등 추가 속성 (class_처럼 끝의 _는 제거)
+    """
+    if not url:
+        return Markup('')
+    candidates = srcset(url, width, widths)
+    if candidates:
+        src_width = min(default_width, width) if width else default_width
+        attributes = {'src': f'{url}?w={src_width}', 'srcset': candidates, 'sizes': sizes}
+    else:
+        attributes = {'src': url}
+    if width and height:
+        attributes['width'] = width
+        attributes['height'] = height
+    if lazy:
+        attributes['loading'] = 'lazy'
+        attributes['decoding'] = 'async'
+    else:
+        attributes['fetchpriority'] = 'high'
+    for name, value in attrs.items():
+        if value is not None:
+            attributes[name.rstrip('_')] = value
+    background = placeholder_style(placeholder, color)
+    if background:
+        style = attributes.get('style', '').strip().rstrip(';')
+        attributes['style'] = f'{style}; {background}' if style else background
+    return Markup('<img {}>'.format(' '.join(
+        f'{name}="{escape(value)}"' for name, value in attributes.items()
+    )))
+
+
+def init_responsive_images(app):
+    """템플릿 전역 함수/상수 등록"""
+    app.jinja_env.globals.update(
+        responsive_img=responsive_img,
+        THUMBNAIL_SIZES=THUMBNAIL_SIZES,
+        DETAIL_SIZES=DETAIL_SIZES,
+    )
@@ -1,27 +1,152 @@
 import os
 import secrets
 import base64
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, abort, Response, session, jsonify
+from contextlib import ExitStack
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, abort, Response, session, jsonify, make_response, stream_template, stream_with_context
 from flask_login import login_user, logout_user, current_user, login_required
 from werkzeug.utils import secure_filename
-from sqlalchemy.orm import joinedload, defer, load_only
+from sqlalchemy.orm import joinedload, selectinload, defer, load_only
 from sqlalchemy import func
-from . import db, oauth, login_manager, cache
-from .models import User, Post, Setting, PostImage
+from . import db, oauth, login_manager, cache, page_cache, image_cache
+from .models import User, Post, Setting, PostImage, PostCounter
 from .forms import PostForm, AdminUserForm
+from .content import content_html_for
+from .db_routing import replica_read, pin_primary
 
 bp = Blueprint('main', __name__)
 
 # 캐시 무효화 헬퍼 함수
 def invalidate_cache(category):
-    """카테고리에 따라 관련 캐시 삭제"""
+    """카테고리에 따라 관련 캐시 삭제
+    
+    목록 페이지 캐시는 삭제하지 않는다. 글 변경 시 증가한 세대 번호(ETag)와 맞지 않는
+    항목은 page_cache가 오래된 항목으로 보고, 한 요청만 다시 렌더링하는 동안
+    나머지 요청에는 기존 항목을 반환한다.
+    """
     cache.delete('index_gallery_posts')
+    
+    # 첫 방문자가 렌더링 비용을 부담하지 않도록 백그라운드 예열
+    from .warmup import schedule_warmup
+    schedule_warmup(current_app._get_current_object(), [category])
+
+def page_cache_key(category, page, lang='ko'):
+    """목록 페이지 캐시 키 (gallery/archive와 캐시 예열이 같은 규칙 사용)"""
     if category == 'gallery':
-        for i in range(1, 11):
-            cache.delete(f'gallery_posts_page_{i}')
-    elif category in ['archive_1', 'archive_2']:
-        for i in range(1, 11):
-            cache.delete(f'archive_{category}_page_{i}')
+        return f'gallery_posts_page_{page}_{lang}'
+    return f'archive_{category}_page_{page}_{lang}'
+
+# 공개 카테고리 목록
+CATEGORIES = ['gallery', 'archive_1', 'archive_2']
+
+# 상세 페이지에서 추가 이미지(PostImage)를 표시할 때 필요한 컬럼 (image_data는 렌디션 라우트에서만 읽음)
+DETAIL_IMAGE_COLUMNS = (PostImage.id, PostImage.post_id, PostImage.order, PostImage.image_width,
+                        PostImage.image_height, PostImage.image_placeholder, PostImage.image_color)
+
+SUPPORTED_LANGUAGES = ['ko', 'en']
+DEFAULT_LANGUAGE = 'ko'
+
+def get_language():
+    """현재 요청의 언어 (세션에 쓰지 않음 - 익명 응답에 Set-Cookie가 붙지 않도록)
+    
+    우선순위: ?lang= 파라미터 → /lang/<code>로 직접 고른 세션 값 → Accept-Language → 'ko'
+    Accept-Language에 따라 응답이 달라지므로 apply_http_cache가 Vary에 추가한다.
+    """
+    from flask import g
+    lang = g.get('language')
+    if lang is None:
+        lang = request.args.get('lang')
+        if lang not in SUPPORTED_LANGUAGES:
+            lang = session.get('language')
+        if lang not in SUPPORTED_LANGUAGES:
+            lang = request.accept_languages.best_match(SUPPORTED_LANGUAGES, default=DEFAULT_LANGUAGE)
+        g.language = lang
+    return lang
+
+# HTTP 캐시 검증자(ETag) 헬퍼 함수
+def listing_etag(categories, *parts, generations=None):
+    """카테고리 세대 번호로 목록 응답의 ETag 생성
+    
+    세대 번호는 글 작성/수정/삭제 시 같은 트랜잭션에서 증가하므로(PostCounter.touch)
+    게시글을 조회하거나 템플릿을 렌더링하기 전에 기본 키 조회 한 번으로 계산할 수 있다.
+    HTML은 언어/로그인 사용자에 따라 달라지므로 함께 포함한다.
+    """
+    import hashlib
+    if generations is None:
+        generations = PostCounter.get_many([f'generation:{c}' for c in categories])
+    user_key = current_user.get_id() if current_user.is_authenticated else 'anon'
+    raw = '|'.join(
+        [f'{c}={generations.get(f"generation:{c}", 0)}' for c in categories] +
+        [get_language(), user_key] +
+        [str(p) for p in parts]
+    )
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+def detail_etag(post_id, category):
+    """상세 페이지 ETag (카테고리 세대 번호 + 게시글 updated_at)
+    
+    세대 번호는 이전/다음 글 링크가 바뀌는 작성/삭제까지, updated_at은 render-content처럼
+    세대 번호를 올리지 않는 수정까지 반영한다. 게시글이 없거나 카테고리가 다르면 404.
+    """
+    row = db.session.query(Post.category, Post.updated_at).filter_by(id=post_id).first()
+    if row is None or row.category != category:
+        abort(404)
+    return listing_etag([category], 'detail', post_id, row.updated_at)
+
+def apply_http_cache(response, etag, s_maxage=60, stale_while_revalidate=300):
+    """ETag와 Cache-Control 헤더 설정 (Vercel 엣지 캐시용 s-maxage 포함)"""
+    response.set_etag(etag)
+    if current_user.is_authenticated:
+        # 로그인 사용자 화면(관리 메뉴 등)은 공유 캐시에 저장하지 않음
+        response.headers['Cache-Control'] = 'private, no-cache'
+    else:
+        response.headers['Cache-Control'] = (
+            f'public, max-age=0, s-maxage={s_maxage}, stale-while-revalidate={stale_while_revalidate}'
+        )
+    response.vary.add('Cookie')
+    response.vary.add('Accept-Language')
+    return response
+
+def not_modified(etag):
+    """If-None-Match가 현재 ETag와 일치하면 304 응답 반환, 아니면 None"""
+    if request.if_none_match.contains_weak(etag):
+        return apply_http_cache(Response(status=304), etag)
+    return None
+
+def cached_response(rv, etag, **kwargs):
+    """뷰 반환값(HTML 문자열 등)을 캐시 헤더가 설정된 응답으로 변환"""
+    return apply_http_cache(make_response(rv), etag, **kwargs)
+
+def render_chunks(template_name, **context):
+    """템플릿을 스트리밍 렌더링하며 STREAM_CHUNK_SIZE 바이트 정도씩 묶어 내보내기
+    
+    Jinja는 태그/변수 단위의 아주 작은 문자열을 내보내므로 그대로 쓰면 전송 단위가 너무 잘다.
+    첫 조각(<head>, CSS, 내비게이션)은 본문 렌더링을 기다리지 않고 바로 전송된다.
+    """
+    chunk_size = current_app.config.get('STREAM_CHUNK_SIZE', 4096)
+    buffer, size = [], 0
+    for piece in stream_template(template_name, **context):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def streamed_response(chunks, etag=None, **kwargs):
+    """렌더링 조각으로 HTML 응답 생성
+    
+    캐시된 조각 목록(list)은 일반 응답으로 보내고 (압축/압축 결과 캐시 적용),
+    렌더링 중인 제너레이터는 요청 컨텍스트를 유지한 채 스트리밍한다.
+    (stream_with_context로 요청 컨텍스트와 DB 세션은 스트리밍이 끝날 때까지 열려 있다.)
+    스트리밍이 시작된 뒤에는 오류를 404 등으로 바꿀 수 없으므로 DB 조회는 미리 끝내 둔다.
+    """
+    if not isinstance(chunks, list):
+        chunks = stream_with_context(chunks)
+    response = Response(chunks, mimetype='text/html')
+    if etag is None:
+        return response
+    return apply_http_cache(response, etag, **kwargs)
 
 # 아카이브 제목 헬퍼 함수
 def get_archive_title(type_name, lang='ko'):
@@ -34,8 +159,13 @@ def get_archive_title(type_name, lang='ko'):
 # Static 파일 직접 서빙 (Vercel 환경 대응, 캐싱 최적화)
 @bp.route('/static/<path:filename>')
 def serve_static(filename):
-    """Static 파일을 직접 서빙 (루트의 static 폴더, 캐싱 헤더 포함)"""
+    """Static 파일을 직접 서빙 (루트의 static 폴더, 캐싱 헤더 포함)
+    
+    build-assets로 만든 사전 압축본(.br/.gz)이 있으면 Accept-Encoding에 맞춰 전송한다.
+    """
     from flask import send_from_directory, current_app
+    import mimetypes
+    from .assets import find_precompressed, is_fingerprinted
     # Vercel 환경과 로컬 환경 모두 대응
     # app 폴더의 부모 디렉토리(프로젝트 루트)의 static 폴더
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -45,11 +175,25 @@ def serve_static(filename):
     if not os.path.exists(static_dir):
         static_dir = current_app.static_folder
     
-    response = send_from_directory(static_dir, filename)
+    send_name, encoding, has_variants = find_precompressed(
+        static_dir, filename, request.accept_encodings
+    )
+    mimetype = mimetypes.guess_type(filename)[0] if encoding else None
+    response = send_from_directory(static_dir, send_name, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if has_variants:
+        response.vary.add('Accept-Encoding')
     
     # 정적 파일 캐싱 헤더 설정
-    if filename.endswith(('.css', '.js', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.woff', '.woff2', '.ttf', '.eot')):
-        # CSS, JS, 이미지, 폰트 파일은 1년 캐싱
+    if is_fingerprinted(filename):
+        # 내용 해시가 파일명에 포함된 빌드 결과물은 1년 캐싱
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    elif filename.endswith(('.css', '.js')):
+        # 지문 없는 CSS/JS는 배포 후 바로 갱신되도록 짧게 캐싱
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    elif filename.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.woff', '.woff2', '.ttf', '.eot')):
+        # 이미지, 폰트 파일은 1년 캐싱
         response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
     else:
         # 기타 파일은 1시간 캐싱
@@ -83,28 +227,55 @@ def get_google_client():
 def load_user(user_id):
     return User.query.get(user_id)
 
+def get_recent_schedules(limit=30):
+    """홈 화면용 최근 스케줄 목록 (캐시에 미리 계산된 목록 우선 사용)
+    
+    템플릿은 id/title/category만 사용하므로 ORM 객체 대신 dict 목록을 캐싱한다.
+    글 작성/수정/삭제 및 티스토리 동기화 시 invalidate_cache()가 이 키를 삭제한다.
+    """
+    recent_schedules = cache.get('index_gallery_posts')
+    if recent_schedules is None:
+        # 필요한 컬럼만 조회 (user 조인, 본문/이미지 로드 없음)
+        rows = db.session.query(Post.id, Post.title, Post.category).order_by(
+            Post.created_at.desc()
+        ).limit(limit).all()
+        recent_schedules = [
+            {'id': row.id, 'title': row.title, 'category': row.category}
+            for row in rows
+        ]
+        cache.set('index_gallery_posts', recent_schedules, timeout=600)
+    return recent_schedules
+
 @bp.route('/')
+@replica_read
 def index():
     try:
-        # 최근 스케줄 30개를 가져옴 (모든 카테고리에서 최신순)
-        recent_schedules = db.session.query(Post).options(
-            joinedload(Post.author),
-            defer(Post.image_data),  # 대용량 이미지 데이터 제외
-            defer(Post.content)  # content는 필요할 때만 가져옴
-        ).order_by(Post.created_at.desc()).limit(30).all()
-        return render_template('index.html', recent_schedules=recent_schedules)
+        etag = listing_etag(CATEGORIES, 'index')
+        response = not_modified(etag)
+        if response:
+            return response
+        
+        # 최근 스케줄 30개 (모든 카테고리에서 최신순, 캐시 사용)
+        recent_schedules = get_recent_schedules()
+        return cached_response(render_template('index.html', recent_schedules=recent_schedules), etag)
     except Exception as e:
         current_app.logger.error(f"Error in index route: {str(e)}")
         # DB 스키마가 업데이트되지 않은 경우를 대비해 빈 결과 반환
         return render_template('index.html', recent_schedules=[])
 
 @bp.route('/api/gallery-posts')
+@replica_read
 def api_gallery_posts():
     """갤러리 포스트를 JSON으로 반환 (순차 로딩용)"""
     try:
         offset = request.args.get('offset', 0, type=int)
         limit = request.args.get('limit', 10, type=int)
         
+        etag = listing_etag(['gallery'], 'api', offset, limit)
+        response = not_modified(etag)
+        if response:
+            return response
+        
         posts = db.session.query(Post).options(
             joinedload(Post.author),
             defer(Post.image_data),
@@ -120,6 +291,7 @@ def api_gallery_posts():
                     image_url = post.get_image_url(use_thumbnail=False)
             except Exception:
                 pass
+            image_placeholder, image_color = post.get_image_placeholder()
             
             posts_data.append({
                 'id': post.id,
@@ -127,36 +299,45 @@ def api_gallery_posts():
                 'created_at': post.created_at.strftime('%Y.%m.%d') if post.created_at else '',
                 'author_name': '아이유닷컴' if post.author.is_admin() else post.author.name,
                 'image_url': image_url,
+                'image_placeholder': image_placeholder,
+                'image_color': image_color,
                 'has_image': post.has_image_data() if hasattr(post, 'has_image_data') else (post.image_filename or post.image_url)
             })
         
-        return jsonify({'success': True, 'posts': posts_data, 'count': len(posts_data)})
+        return cached_response(jsonify({'success': True, 'posts': posts_data, 'count': len(posts_data)}), etag)
     except Exception as e:
         current_app.logger.error(f"Error in api_gallery_posts: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @bp.route('/api/stats')
-@cache.cached(timeout=300, key_prefix='site_stats')  # 5분 캐싱
+@replica_read
 def api_stats():
-    """사이트 통계 정보 반환"""
+    """사이트 통계 정보 반환 (카운터 테이블 기본 키 조회 한 번)"""
     try:
         from datetime import datetime, timedelta
-        from sqlalchemy import func
         
-        # 총 게시글 수
-        total_posts = db.session.query(func.count(Post.id)).scalar() or 0
+        categories = CATEGORIES
+        today = datetime.utcnow().date()
+        days = [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
         
-        # 오늘 게시글 수
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_posts = db.session.query(func.count(Post.id)).filter(
-            Post.created_at >= today_start
-        ).scalar() or 0
+        # 통계와 ETag용 세대 번호를 한 번에 조회
+        keys = ['total'] + [f'category:{c}' for c in categories] + [f'day:{d}' for d in days] + \
+            [f'generation:{c}' for c in categories]
+        counters = PostCounter.get_many(keys)
         
-        return jsonify({
+        # 날짜가 바뀌면 오늘/일별 통계도 바뀌므로 ETag에 포함
+        etag = listing_etag(categories, 'stats', days[0], generations=counters)
+        response = not_modified(etag)
+        if response:
+            return response
+        
+        return cached_response(jsonify({
             'success': True,
-            'total_posts': total_posts,
-            'today_posts': today_posts
-        })
+            'total_posts': counters['total'],
+            'today_posts': counters[f'day:{days[0]}'],
+            'categories': {c: counters[f'category:{c}'] for c in categories},
+            'daily': [{'date': d, 'count': counters[f'day:{d}']} for d in days]
+        }), etag, s_maxage=30)
     except Exception as e:
         current_app.logger.error(f"Error in api_stats: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -227,13 +408,7 @@ def change_language(lang_code):
         session['language'] = lang_code
         session.permanent = True  # 세션을 영구적으로 저장
         session.modified = True  # 세션 수정 표시
-        
-        # 캐시 무효화 (언어 변경 시)
-        cache.delete('index_gallery_posts')
-        for i in range(1, 11):
-            cache.delete(f'gallery_posts_page_{i}')
-            cache.delete(f'archive_archive_1_page_{i}')
-            cache.delete(f'archive_archive_2_page_{i}')
+        # 목록 페이지 캐시 키에 언어가 포함되어 있으므로 캐시 삭제 불필요
     
     # AJAX 요청인 경우 JSON 응답
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -250,111 +425,127 @@ def change_language(lang_code):
             return redirect(referrer)
     return redirect(url_for('main.index'))
 
-@bp.route('/image/<int:post_id>')
-def get_image(post_id):
-    """DB에 저장된 이미지를 반환하는 라우트 (WebP 지원 및 캐싱 최적화)"""
+def image_response(image_bytes, mimetype, etag, vary_accept=False):
+    """이미지 응답 생성 (ETag 일치 시 304)"""
+    if request.headers.get('If-None-Match') == etag:
+        response = Response(status=304)
+    else:
+        response = Response(image_bytes, mimetype=mimetype)
+        # 캐싱 헤더 설정 (1년 캐싱)
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        response.headers['ETag'] = etag
+    if vary_accept:
+        response.headers['Vary'] = 'Accept'  # AVIF/WebP 지원 여부에 따라 다른 응답
+    return response
+
+def image_columns(image_data):
+    """이미지 데이터에서 계산하는 컬럼 값 (내용 해시, 원본 크기, 미리보기/대표 색) - Post/PostImage 공용
+    
+    미리보기 계산에 실패하면 image_placeholder를 ''로 저장해 (None은 아직 계산하지 않음)
+    렌디션 요청마다 다시 디코딩하지 않게 한다.
+    """
+    values = {'image_hash': None, 'image_width': None, 'image_height': None,
+              'image_placeholder': None, 'image_color': None}
+    if not image_data:
+        return values
+    from .imaging import image_size, placeholder
+    values['image_hash'] = image_cache.content_hash(image_data)
+    values['image_width'], values['image_height'] = image_size(image_data)
     try:
-        post = Post.query.get_or_404(post_id)
-        if post.image_data:
-            # Postgres의 경우 bytes 객체로 반환되어야 함
-            image_bytes = bytes(post.image_data) if not isinstance(post.image_data, bytes) else post.image_data
-            
-            # 쿼리 파라미터로 크기 제한 확인 (카드 스택 최적화용)
-            max_width = request.args.get('w', type=int)
-            max_height = request.args.get('h', type=int)
-            
-            # WebP 지원 확인
-            accept_header = request.headers.get('Accept', '')
-            supports_webp = 'image/webp' in accept_header
-            
-            # 크기 제한이 있으면 이미지 리사이징
-            if max_width or max_height or supports_webp:
-                try:
-                    from PIL import Image
-                    import io
-                    img = Image.open(io.BytesIO(image_bytes))
-                    
-                    # RGBA 모드인 경우 RGB로 변환 (JPEG 호환성)
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        if supports_webp:
-                            # WebP는 알파 채널 지원
-                            pass
-                        else:
-                            # JPEG는 알파 채널 미지원, RGB로 변환
-                            rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                            if img.mode == 'P':
-                                img = img.convert('RGBA')
-                            rgb_img.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                            img = rgb_img
-                    elif img.mode != 'RGB' and not supports_webp:
-                        img = img.convert('RGB')
-                    
-                    original_width, original_height = img.size
-                    
-                    # 비율 유지하며 리사이징
-                    if max_width or max_height:
-                        if max_width and max_height:
-                            # 둘 다 지정된 경우 비율 유지하며 작은 쪽에 맞춤
-                            ratio = min(max_width / original_width, max_height / original_height)
-                            new_width = int(original_width * ratio)
-                            new_height = int(original_height * ratio)
-                        elif max_width:
-                            ratio = max_width / original_width
-                            new_width = max_width
-                            new_height = int(original_height * ratio)
-                        else:
-                            ratio = max_height / original_height
-                            new_width = int(original_width * ratio)
-                            new_height = max_height
-                        
-                        # 원본보다 크면 리사이징하지 않음
-                        if new_width < original_width or new_height < original_height:
-                            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    
-                    output = io.BytesIO()
-                    
-                    # WebP 지원 시 WebP로 변환 (압축 효율 향상)
-                    if supports_webp:
-                        img.save(output, format='WEBP', quality=85, method=6)
-                        mimetype = 'image/webp'
-                    else:
-                        img_format = img.format or 'JPEG'
-                        if img_format == 'PNG' and img.mode == 'RGB':
-                            # PNG를 JPEG로 변환 (더 작은 파일 크기)
-                            img_format = 'JPEG'
-                        img.save(output, format=img_format, quality=85, optimize=True)
-                        mimetype = 'image/jpeg' if img_format == 'JPEG' else (post.image_mimetype or 'image/jpeg')
-                    
-                    image_bytes = output.getvalue()
-                except ImportError:
-                    # PIL이 없으면 원본 반환
-                    mimetype = post.image_mimetype or 'image/jpeg'
-                except Exception as e:
-                    current_app.logger.warning(f"Image resize failed: {str(e)}, returning original")
-                    mimetype = post.image_mimetype or 'image/jpeg'
-            else:
-                mimetype = post.image_mimetype or 'image/jpeg'
-            
-            # ETag 생성 (캐싱 최적화)
+        values['image_placeholder'], values['image_color'] = placeholder(
+            image_data, max_pixels=current_app.config.get('IMAGE_MAX_PIXELS'))
+    except Exception as e:
+        values['image_placeholder'] = ''
+        current_app.logger.warning(f"Image placeholder failed: {str(e)}")
+    return values
+
+def serve_image_rendition(kind, model, object_id):
+    """DB 이미지를 요청 크기(?w=, ?h=)와 협상된 포맷(AVIF/WebP/JPEG)으로 반환
+
+    메모리 캐시(DB 접근 없음) → 디스크 렌디션 캐시(해시만 조회) → DB 원본 순서로 확인하고,
+    새로 만든 렌디션은 두 캐시에 모두 저장해 포맷별로 한 번만 인코딩한다.
+    """
+    from . import imaging
+
+    # 쿼리 파라미터로 크기 제한 확인 (카드 스택 최적화용)
+    max_width = request.args.get('w', type=int)
+    max_height = request.args.get('h', type=int)
+
+    # Accept 헤더로 출력 포맷 선택 (AVIF → WebP → JPEG)
+    fmt = imaging.negotiate_format(request.accept_mimetypes,
+                                   allow_avif=current_app.config.get('IMAGE_AVIF_ENABLED', True))
+
+    # 메모리 캐시 우선 확인 (DB 접근 없음)
+    cache_key = image_cache.rendition_key(kind, object_id, max_width, max_height, fmt)
+    cached = image_cache.get(cache_key)
+    if cached:
+        return image_response(*cached, vary_accept=True)
+
+    # 디스크 렌디션 캐시 확인 (이미지 데이터 없이 해시만 조회)
+    meta = db.session.query(model.image_hash).filter(model.id == object_id).first()
+    if meta is None:
+        abort(404)
+    if meta.image_hash:
+        rendition = image_cache.get_rendition(meta.image_hash, max_width, max_height, fmt)
+        if rendition:
             import hashlib
+            image_bytes, mimetype = rendition
             etag = hashlib.md5(image_bytes).hexdigest()
-            
-            # If-None-Match 헤더 확인 (304 Not Modified 응답)
-            if request.headers.get('If-None-Match') == etag:
-                return Response(status=304)
-            
-            response = Response(image_bytes, mimetype=mimetype)
-            # 캐싱 헤더 설정 (1년 캐싱)
-            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
-            response.headers['ETag'] = etag
-            response.headers['Vary'] = 'Accept'  # WebP 지원 여부에 따라 다른 응답
-            return response
+            image_cache.set(cache_key, image_bytes, mimetype, etag)
+            return image_response(image_bytes, mimetype, etag, vary_accept=True)
+
+    obj = model.query.get_or_404(object_id)
+    if not obj.image_data:
         abort(404)
+    # Postgres의 경우 bytes 객체로 반환되어야 함
+    source = bytes(obj.image_data) if not isinstance(obj.image_data, bytes) else obj.image_data
+
+    # 해시/크기/미리보기를 아직 계산하지 않은 기존 이미지는 이번에 한 번만 계산해서 저장
+    # (크기와 미리보기는 함께 채워지고, 미리보기 실패는 ''로 기록되므로 다시 시도하지 않음)
+    image_hash = obj.image_hash
+    if not image_hash or obj.image_placeholder is None:
+        values = image_columns(source)
+        image_hash = values['image_hash']
+        try:
+            model.query.filter_by(id=object_id).update(values, synchronize_session=False)
+            db.session.commit()
+        except Exception as hash_error:
+            db.session.rollback()
+            current_app.logger.warning(f"Image hash update failed: {str(hash_error)}")
+
+    image_bytes, mimetype = source, obj.image_mimetype or 'image/jpeg'
+    # 크기 제한이 있거나 더 효율적인 포맷을 지원하면 렌디션 생성
+    # (저장된 원본은 JPEG이므로 크기 제한 없는 JPEG 요청은 원본 그대로)
+    if max_width or max_height or fmt != 'jpeg':
+        try:
+            image_bytes, mimetype = imaging.render(source, fmt, max_width, max_height,
+                                                   max_pixels=current_app.config.get('IMAGE_MAX_PIXELS'))
+        except ImportError:
+            # PIL이 없으면 원본 반환
+            pass
+        except Exception as e:
+            current_app.logger.warning(f"Image resize failed: {str(e)}, returning original")
+
+    # ETag 생성 (캐싱 최적화)
+    import hashlib
+    etag = hashlib.md5(image_bytes).hexdigest()
+
+    image_cache.set(cache_key, image_bytes, mimetype, etag)
+    image_cache.set_rendition(image_hash, max_width, max_height, fmt, image_bytes, mimetype)
+    return image_response(image_bytes, mimetype, etag, vary_accept=True)
+
+@bp.route('/image/<int:post_id>')
+@replica_read
+def get_image(post_id):
+    """DB에 저장된 이미지를 반환하는 라우트 (AVIF/WebP 협상 및 캐싱 최적화)"""
+    try:
+        return serve_image_rendition('post', Post, post_id)
     except Exception as e:
         current_app.logger.error(f"Error serving image for post {post_id}: {str(e)}")
         abort(404)
 
 @bp.route('/image/<int:post_id>/download')
+@replica_read
 def download_original_image(post_id):
     """원본 이미지를 다운로드하는 라우트 (크기 제한 없음)"""
     try:
@@ -397,18 +588,18 @@ def download_original_image(post_id):
 def save_picture(form_picture, max_size=None):
     """이미지를 DB에 저장할 포맷으로 변환하고 (image_data, image_mimetype) 튜플 반환
     
+    업로드 파일 스트림(디스크에 스풀된 임시 파일)에서 바로 디코딩하므로
+    원본 전체를 메모리에 읽지 않는다. 변환에 실패한 경우에만 원본을 읽어 저장한다.
+    
     Args:
-        form_picture: 업로드된 파일 객체
+        form_picture: 업로드된 파일 객체 (FileStorage)
         max_size (int, optional): 최대 긴 변의 크기 (px). None이면 썸네일용 기본값(1200) 사용.
     """
     if not form_picture:
         return None, None
         
-    # 파일 데이터 읽기
-    raw_data = form_picture.read()
-    
-    # 파일 포인터 리셋 (재사용을 위해)
-    form_picture.seek(0)
+    stream = form_picture.stream
+    stream.seek(0)
 
     # 기본 MIME 타입 (썸네일은 JPEG/WebP 등으로 압축)
     mimetype = form_picture.content_type or 'image/jpeg'
@@ -416,10 +607,8 @@ def save_picture(form_picture, max_size=None):
         mimetype = 'image/jpeg'
 
     try:
-        from PIL import Image
         import io
-
-        img = Image.open(io.BytesIO(raw_data))
+        from .imaging import load_resized, flatten_alpha
 
         # 리사이징 크기 설정
         if max_size:
@@ -427,26 +616,13 @@ def save_picture(form_picture, max_size=None):
         else:
             # 기본 썸네일 크기
             max_w, max_h = 800, 1200
-            
-        orig_w, orig_h = img.size
 
-        # 비율 유지하며 축소
-        ratio = min(max_w / orig_w, max_h / orig_h)
-        # 원본보다 작게 설정된 경우에만 축소
-        if ratio < 1.0:
-            new_w = int(orig_w * ratio)
-            new_h = int(orig_h * ratio)
-            img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+        # 비율 유지하며 축소 (원본보다 작게 설정된 경우에만, JPEG는 디코딩 단계에서 축소)
+        img, _ = load_resized(stream, max_w, max_h,
+                              max_pixels=current_app.config.get('IMAGE_MAX_PIXELS'))
 
         # 알파 채널이 있는 경우 배경 흰색으로 합성하여 JPEG로 저장
-        if img.mode in ('RGBA', 'LA', 'P'):
-            rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            rgb_img.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-            img = rgb_img
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        img = flatten_alpha(img)
 
         output = io.BytesIO()
         # 썸네일은 JPEG로 저장 (용량 절감)
@@ -456,27 +632,69 @@ def save_picture(form_picture, max_size=None):
     except Exception as e:
         # Pillow가 없거나 변환 실패 시 원본 데이터를 그대로 저장 (최후의 보루)
         current_app.logger.warning(f"Thumbnail generation failed, storing original image: {str(e)}")
-        image_data = raw_data
+        stream.seek(0)
+        image_data = stream.read()
 
+    # 파일 포인터 리셋 (재사용을 위해)
+    stream.seek(0)
     return (image_data, mimetype)
 
+def upload_error_response(error):
+    return jsonify(dict(error.extra, success=False, message=str(error))), error.status
+
+@bp.route('/upload', methods=['POST'])
+@login_required
+def start_chunked_upload():
+    """분할 업로드 시작 (JSON: filename, size, content_type) → upload_id"""
+    if not current_user.is_writer():
+        abort(403)
+    from .uploads import start_upload, UploadError
+    data = request.get_json(silent=True) or {}
+    try:
+        size = int(data.get('size') or 0)
+    except (TypeError, ValueError):
+        size = 0
+    try:
+        upload_id = start_upload(current_user.id, data.get('filename'), size, data.get('content_type'))
+    except UploadError as e:
+        return upload_error_response(e)
+    return jsonify({'success': True, 'upload_id': upload_id, 'offset': 0})
+
+@bp.route('/upload/<upload_id>', methods=['GET', 'PUT'])
+@login_required
+def chunked_upload(upload_id):
+    """GET: 현재까지 받은 바이트 수 / PUT ?offset=N: 요청 본문을 이어 쓰기"""
+    from .uploads import upload_status, append_chunk, UploadError
+    try:
+        if request.method == 'GET':
+            return jsonify(dict(upload_status(upload_id, current_user.id), success=True))
+        offset = request.args.get('offset', type=int)
+        if offset is None:
+            return jsonify({'success': False, 'message': 'offset is required'}), 400
+        # 본문은 request.stream에서 블록 단위로 읽어 파일에 씀 (메모리에 모으지 않음)
+        new_offset = append_chunk(upload_id, current_user.id, offset, request.stream)
+    except UploadError as e:
+        return upload_error_response(e)
+    return jsonify({'success': True, 'upload_id': upload_id, 'offset': new_offset})
+
+@bp.route('/upload/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_chunked_upload(upload_id):
+    """모든 조각 수신 확인 + sha256(선택) / 이미지 검증"""
+    from .uploads import complete_upload, UploadError
+    data = request.get_json(silent=True) or {}
+    try:
+        result = complete_upload(upload_id, current_user.id, data.get('sha256'))
+    except UploadError as e:
+        return upload_error_response(e)
+    return jsonify(dict(result, success=True))
+
 @bp.route('/post/image/<int:image_id>')
+@replica_read
 def get_post_image(image_id):
-    """게시글의 추가 이미지 서빙"""
+    """게시글의 추가 이미지 서빙 (get_image와 같은 렌디션 파이프라인)"""
     try:
-        image = PostImage.query.get_or_404(image_id)
-        
-        # ETag 생성
-        import hashlib
-        etag = hashlib.md5(image.image_data).hexdigest()
-        
-        if request.headers.get('If-None-Match') == etag:
-            return Response(status=304)
-            
-        response = Response(image.image_data, mimetype=image.image_mimetype)
-        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
-        response.headers['ETag'] = etag
-        return response
+        return serve_image_rendition('post_image', PostImage, image_id)
     except Exception as e:
         current_app.logger.error(f"Error serving post image {image_id}: {str(e)}")
         abort(404)
@@ -505,52 +723,77 @@ def new_post():
         # 빈 파일 필터링
         files = [f for f in files if f.filename]
         
-        if form.category.data == 'gallery':
-            if image_url:
+        # 분할 업로드(/upload)로 미리 올린 파일 (일찍 반환하거나 예외가 나도 with 블록을 나가면 닫힘)
+        upload_ids = request.form.getlist('upload_ids')
+        with ExitStack() as uploads:
+            if upload_ids:
+                from .uploads import open_uploads, UploadError
+                try:
+                    files += uploads.enter_context(open_uploads(upload_ids, current_user.id))
+                except UploadError as e:
+                    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                        return {'success': False, 'message': str(e)}, e.status
+                    flash(str(e), 'danger')
+                    return render_template('create_post.html', title='New Post', form=form)
+        
+            if form.category.data == 'gallery':
+                if image_url:
+                    # URL이 있으면 URL 사용 (관리자만)
+                    pass
+                elif files:
+                    # 첫 번째 이미지를 대표 썸네일로 사용
+                    image_data, image_mimetype = save_picture(files[0])
+                    files[0].seek(0) # 포인터 초기화
+                else:
+                    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                        return {'success': False, 'message': '갤러리에는 이미지가 필수입니다.'}, 400
+                    flash('갤러리에는 이미지가 필수입니다.', 'danger')
+                    return render_template('create_post.html', title='New Post', form=form)
+            elif image_url:
                 # URL이 있으면 URL 사용 (관리자만)
                 pass
             elif files:
-                # 첫 번째 이미지를 대표 썸네일로 사용
-                image_data, image_mimetype = save_picture(files[0])
-                files[0].seek(0) # 포인터 초기화
-            else:
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return {'success': False, 'message': '갤러리에는 이미지가 필수입니다.'}, 400
-                flash('갤러리에는 이미지가 필수입니다.', 'danger')
-                return render_template('create_post.html', title='New Post', form=form)
-        elif image_url:
-            # URL이 있으면 URL 사용 (관리자만)
-            pass
-        elif files:
-             image_data, image_mimetype = save_picture(files[0])
-             files[0].seek(0)
+                 image_data, image_mimetype = save_picture(files[0])
+                 files[0].seek(0)
              
-        post = Post(
-            title=form.title.data,
-            content=form.content.data.strip() if form.content.data else '',
-            category=form.category.data,
-            image_data=image_data,
-            image_mimetype=image_mimetype,
-            image_url=image_url,
-            author=current_user
-        )
-        db.session.add(post)
-        db.session.flush() # ID 생성을 위해 flush
-        
-        # 추가 이미지 저장 (모든 업로드된 이미지 저장)
-        if files:
-            for i, file in enumerate(files):
-                if file.filename:
-                    # 상세 페이지용 고화질 (최대 2500px)
-                    img_data, img_mime = save_picture(file, max_size=2500)
-                    post_image = PostImage(
-                        image_data=img_data, 
-                        image_mimetype=img_mime,
-                        order=i
-                    )
-                    post.images.append(post_image)
+            content = form.content.data.strip() if form.content.data else ''
+            post = Post(
+                title=form.title.data,
+                content=content,
+                content_html=content_html_for(content),
+                category=form.category.data,
+                image_data=image_data,
+                image_mimetype=image_mimetype,
+                image_url=image_url,
+                **image_columns(image_data),
+                author=current_user
+            )
+            db.session.add(post)
+            db.session.flush() # ID 생성을 위해 flush
+            PostCounter.record_created(post.category, post.created_at)
         
-        db.session.commit()
+            # 추가 이미지 저장 (모든 업로드된 이미지 저장)
+            if files:
+                for i, file in enumerate(files):
+                    if file.filename:
+                        # 상세 페이지용 고화질 (최대 2500px)
+                        img_data, img_mime = save_picture(file, max_size=2500)
+                        post_image = PostImage(
+                            image_data=img_data, 
+                            image_mimetype=img_mime,
+                            order=i,
+                            **image_columns(img_data)
+                        )
+                        post.images.append(post_image)
+        
+            db.session.commit()
+            # 복제본에 반영되기 전에도 작성자에게는 새 글이 보이도록
+            pin_primary()
+        
+        # 분할 업로드 임시 파일 정리
+        if upload_ids:
+            from .uploads import discard_uploads
+            discard_uploads(upload_ids)
         
         # 캐시 무효화
         invalidate_cache(form.category.data)
@@ -574,6 +817,7 @@ def new_post():
     return render_template('create_post.html', title='New Post', form=form)
 
 @bp.route('/gallery')
+@replica_read
 def gallery():
     try:
         # 페이지네이션 추가 (페이지당 8개)
@@ -583,56 +827,58 @@ def gallery():
         # 검색어 가져오기
         search_query = request.args.get('q', '').strip()
         
-        # 검색어가 있으면 캐시 사용하지 않음 (동적 검색 결과)
-        use_cache = not search_query
-        
-        if use_cache:
-            cache_key = f'gallery_posts_page_{page}'
-            cached_result = cache.get(cache_key)
-            if cached_result:
-                return cached_result
-        
-        # 이미지 데이터는 제외하고 메타데이터만 가져오기 (성능 최적화)
-        # content는 썸네일 이미지 추출을 위해 로드 필요
-        posts_query = db.session.query(Post).options(
-            joinedload(Post.author),
-            defer(Post.image_data)  # 대용량 이미지 데이터 제외
-            # content는 썸네일 이미지 추출을 위해 로드
-        ).filter_by(category='gallery')
-        
-        # 검색어가 있으면 제목으로 필터링 (대소문자 구분 없음)
-        if search_query:
-            posts_query = posts_query.filter(Post.title.ilike(f'%{search_query}%'))
-        
-        posts_query = posts_query.order_by(Post.created_at.desc())
-        
-        posts = posts_query.paginate(page=page, per_page=per_page, error_out=False)
+        # 게시글 조회/렌더링 전에 조건부 요청 처리
+        etag = listing_etag(['gallery'], 'gallery', page, search_query)
+        response = not_modified(etag)
+        if response:
+            return response
         
-        # 검색어가 없을 때만 캐싱
-        if use_cache and page == 1:
-            result = render_template('gallery.html', posts=posts.items, pagination=posts, search_query=search_query)
-            # 첫 페이지 캐싱
-            cache.set(cache_key, result, timeout=120)
-            return result
+        def render():
+            # 이미지 데이터는 제외하고 메타데이터만 가져오기 (성능 최적화)
+            # content는 썸네일 이미지 추출을 위해 로드 필요
+            # 썸네일용 추가 이미지도 한 번에 조회 (글마다 지연 로드하는 N+1 쿼리 방지)
+            posts_query = db.session.query(Post).options(
+                joinedload(Post.author),
+                selectinload(Post.images).load_only(*DETAIL_IMAGE_COLUMNS),
+                defer(Post.image_data)  # 대용량 이미지 데이터 제외
+                # content는 썸네일 이미지 추출을 위해 로드
+            ).filter_by(category='gallery')
+            
+            # 검색어가 있으면 제목으로 필터링 (대소문자 구분 없음)
+            if search_query:
+                posts_query = posts_query.filter(Post.title.ilike(f'%{search_query}%'))
+            
+            posts_query = posts_query.order_by(Post.created_at.desc())
+            
+            posts = posts_query.paginate(page=page, per_page=per_page, error_out=False)
+            return render_template('gallery.html', posts=posts.items, pagination=posts, search_query=search_query)
         
-        if use_cache:
-            result = render_template('gallery.html', posts=posts.items, pagination=posts, search_query=search_query)
-            cache.set(cache_key, result, timeout=120)  # 2분 캐싱
-            return result
+        # 검색 결과(동적)와 로그인 사용자 화면은 캐시 없이 반환
+        if search_query or current_user.is_authenticated:
+            return cached_response(render(), etag)
         
-        # 검색어가 있을 때는 캐시 없이 반환
-        return render_template('gallery.html', posts=posts.items, pagination=posts, search_query=search_query)
+        cache_key = page_cache_key('gallery', page, get_language())
+        result, result_etag = page_cache.get_or_render(cache_key, etag, render)
+        return cached_response(result, result_etag)
     except Exception as e:
         current_app.logger.error(f"Error in gallery route: {str(e)}")
         return render_template('gallery.html', posts=[], pagination=None, search_query='')
 
 @bp.route('/gallery/<int:post_id>')
+@replica_read
 def gallery_detail(post_id):
     """갤러리 상세 페이지 - 원본 이미지 보기"""
     try:
-        # Eager loading으로 author 정보도 함께 가져오기
+        # 게시글 조회/렌더링 전에 조건부 요청 처리
+        etag = detail_etag(post_id, 'gallery')
+        response = not_modified(etag)
+        if response:
+            return response
+        
+        # Eager loading으로 author 정보와 추가 이미지도 함께 가져오기 (스트리밍 전에 조회 완료)
         post = db.session.query(Post).options(
-            joinedload(Post.author)
+            joinedload(Post.author),
+            selectinload(Post.images).load_only(*DETAIL_IMAGE_COLUMNS)
         ).filter_by(id=post_id).first_or_404()
         
         if post.category != 'gallery':
@@ -649,12 +895,13 @@ def gallery_detail(post_id):
             Post.id > post_id
         ).order_by(Post.id.asc()).first()
         
-        return render_template('gallery_detail.html', post=post, prev_post=prev_post, next_post=next_post)
+        return streamed_response(render_chunks('gallery_detail.html', post=post, prev_post=prev_post, next_post=next_post), etag)
     except Exception as e:
         current_app.logger.error(f"Error in gallery_detail route: {str(e)}")
         abort(404)
 
 @bp.route('/archive/<type_name>')
+@replica_read
 def archive(type_name):
     if type_name not in ['archive_1', 'archive_2']:
         abort(404)
@@ -663,40 +910,57 @@ def archive(type_name):
         page = request.args.get('page', 1, type=int)
         per_page = 30
         
-        # 캐시 키 생성 (페이지 포함)
-        cache_key = f'archive_{type_name}_page_{page}'
-        cached_result = cache.get(cache_key)
-        if cached_result:
-            return cached_result
+        # 게시글 조회/렌더링 전에 조건부 요청 처리
+        etag = listing_etag([type_name], 'archive', page)
+        response = not_modified(etag)
+        if response:
+            return response
         
-        # 이미지 데이터는 제외하고 메타데이터만 가져오기 (성능 최적화)
-        # content는 썸네일 이미지 추출을 위해 로드 필요
-        posts_query = db.session.query(Post).options(
-            joinedload(Post.author),
-            defer(Post.image_data)  # 대용량 이미지 데이터 제외
-            # content는 썸네일 이미지 추출을 위해 로드
-        ).filter_by(category=type_name).order_by(Post.created_at.desc())
+        title = get_archive_title(type_name, get_language())
         
-        posts = posts_query.paginate(page=page, per_page=per_page, error_out=False)
+        def render():
+            # 이미지 데이터는 제외하고 메타데이터만 가져오기 (성능 최적화)
+            # content는 썸네일 이미지 추출을 위해 로드 필요
+            # 썸네일용 추가 이미지도 한 번에 조회 (글마다 지연 로드하는 N+1 쿼리 방지)
+            posts_query = db.session.query(Post).options(
+                joinedload(Post.author),
+                selectinload(Post.images).load_only(*DETAIL_IMAGE_COLUMNS),
+                defer(Post.image_data)  # 대용량 이미지 데이터 제외
+                # content는 썸네일 이미지 추출을 위해 로드
+            ).filter_by(category=type_name).order_by(Post.created_at.desc())
+            
+            posts = posts_query.paginate(page=page, per_page=per_page, error_out=False)
+            return render_chunks('archive.html', posts=posts.items, pagination=posts, title=title, type_name=type_name)
+        
+        # 로그인 사용자 화면은 캐시 없이 반환
+        if current_user.is_authenticated:
+            return streamed_response(render(), etag)
         
-        title = get_archive_title(type_name, session.get('language', 'ko'))
-        result = render_template('archive.html', posts=posts.items, pagination=posts, title=title, type_name=type_name)
-        cache.set(cache_key, result, timeout=120)
-        return result
+        cache_key = page_cache_key(type_name, page, get_language())
+        chunks, result_etag = page_cache.get_or_stream(cache_key, etag, render)
+        return streamed_response(chunks, result_etag)
     except Exception as e:
         current_app.logger.error(f"Error in archive route: {str(e)}")
-        title = get_archive_title(type_name, session.get('language', 'ko'))
+        title = get_archive_title(type_name, get_language())
         return render_template('archive.html', posts=[], pagination=None, title=title, type_name=type_name)
 
 @bp.route('/archive/<type_name>/<int:post_id>')
+@replica_read
 def archive_detail(type_name, post_id):
     """아카이브 상세 페이지 - 원본 이미지 보기"""
     if type_name not in ['archive_1', 'archive_2']:
         abort(404)
     try:
-        # Eager loading으로 author 정보도 함께 가져오기
+        # 게시글 조회/렌더링 전에 조건부 요청 처리
+        etag = detail_etag(post_id, type_name)
+        response = not_modified(etag)
+        if response:
+            return response
+        
+        # Eager loading으로 author 정보와 추가 이미지도 함께 가져오기 (스트리밍 전에 조회 완료)
         post = db.session.query(Post).options(
-            joinedload(Post.author)
+            joinedload(Post.author),
+            selectinload(Post.images).load_only(*DETAIL_IMAGE_COLUMNS)
         ).filter_by(id=post_id).first_or_404()
         
         if post.category != type_name:
@@ -713,8 +977,8 @@ def archive_detail(type_name, post_id):
             Post.id > post_id
         ).order_by(Post.id.asc()).first()
         
-        title = get_archive_title(type_name, session.get('language', 'ko'))
-        return render_template('archive_detail.html', post=post, prev_post=prev_post, next_post=next_post, type_name=type_name, title=title)
+        title = get_archive_title(type_name, get_language())
+        return streamed_response(render_chunks('archive_detail.html', post=post, prev_post=prev_post, next_post=next_post, type_name=type_name, title=title), etag)
     except Exception as e:
         current_app.logger.error(f"Error in archive_detail route: {str(e)}")
         abort(404)
@@ -741,6 +1005,22 @@ def admin():
                          tistory_sync_interval=tistory_sync_interval,
                          tistory_default_category=tistory_default_category)
 
+@bp.route('/admin/cache/stats')
+@login_required
+def cache_stats():
+    """캐시 통계 (관리자 전용, 현재 워커 프로세스 기준)"""
+    if not current_user.is_admin():
+        abort(403)
+    from . import imaging, db_pool, db_routing
+    return jsonify({
+        'success': True,
+        'page_cache': page_cache.stats(),
+        'image_cache': image_cache.stats(),
+        'image_formats': imaging.stats(),
+        'db_pool': db_pool.stats(db.engine),
+        'db_routing': db_routing.stats(),
+    })
+
 @bp.route('/admin/user/<user_id>', methods=['POST'])
 @login_required
 def update_user_role(user_id):
@@ -764,7 +1044,11 @@ def edit_post(post_id):
     if not current_user.is_admin():
         abort(403)
     
-    post = Post.query.get_or_404(post_id)
+    # 수정 가능한 컬럼과 이미지 메타데이터만 조회 (image_data는 읽지 않음)
+    post = Post.query.options(load_only(
+        Post.id, Post.title, Post.content, Post.category, Post.created_at,
+        Post.image_url, Post.image_mimetype, Post.image_filename, Post.image_hash
+    )).filter_by(id=post_id).first_or_404()
     form = PostForm(obj=post)
     
     # AJAX 요청인 경우 폼만 반환
@@ -775,52 +1059,82 @@ def edit_post(post_id):
         return render_template('edit_post.html', form=form, post=post)
     
     if form.validate_on_submit():
-        image_data = post.image_data
-        image_mimetype = post.image_mimetype
+        old_category = post.category
+        # new_post와 같은 방식으로 정리한 본문 저장 (content_html도 같은 입력으로 변환)
+        content = form.content.data.strip() if form.content.data else ''
+        values = {
+            'title': form.title.data,
+            'content': content,
+            'content_html': content_html_for(content),
+            'category': form.category.data,
+        }
         image_url = post.image_url
+        # DB 이미지 존재 여부는 MIME 타입으로 판단 (이미지 데이터를 읽지 않음)
+        has_image_data = bool(post.image_mimetype)
         
         # 관리자인 경우 티스토리 이미지 URL 사용 가능
         if form.image_url.data:
             image_url = form.image_url.data.strip()
             # URL이 변경되면 기존 이미지 데이터는 유지하지 않음
-            if image_url:
-                image_data = None
-                image_mimetype = None
+            if image_url and image_url != post.image_url:
+                values['image_url'] = image_url
+                values['image_data'] = None
+                values['image_mimetype'] = None
+                values.update(image_columns(None))
+                has_image_data = False
         
-        # 새 이미지 파일이 업로드된 경우
-        if form.image.data:
-            image_data, image_mimetype = save_picture(form.image.data)
+        # 새 이미지 파일이 업로드된 경우 (분할 업로드로 올린 파일 포함)
+        upload_ids = request.form.getlist('upload_ids')
+        new_image = form.image.data
+        image_data = None
+        if new_image:
+            image_data, image_mimetype = save_picture(new_image)
+        elif upload_ids:
+            from .uploads import open_uploads, discard_uploads, UploadError
+            try:
+                with open_uploads(upload_ids[:1], current_user.id) as uploaded:
+                    image_data, image_mimetype = save_picture(uploaded[0])
+            except UploadError as e:
+                flash(str(e), 'danger')
+                return render_template('edit_post.html', form=form, post=post)
+            discard_uploads(upload_ids, current_user.id)
+        if image_data:
+            values['image_data'] = image_data
+            values['image_mimetype'] = image_mimetype
+            values.update(image_columns(image_data))
             # 파일 업로드 시 URL은 무시
-            image_url = None
+            values['image_url'] = image_url = None
+            has_image_data = True
         
         # 갤러리 카테고리인 경우 이미지 필수 체크
         if form.category.data == 'gallery':
-            if not image_url and not image_data and not post.image_data:
+            if not image_url and not has_image_data:
                 flash('갤러리에는 이미지가 필수입니다.', 'danger')
                 return render_template('edit_post.html', form=form, post=post)
         
-        post.title = form.title.data
-        post.content = form.content.data
-        post.category = form.category.data
-        if image_data is not None:
-            post.image_data = image_data
-        if image_mimetype is not None:
-            post.image_mimetype = image_mimetype
-        if image_url is not None:
-            post.image_url = image_url
-        
+        # 바뀐 컬럼만 UPDATE (객체를 다시 읽거나 이미지 데이터를 다시 쓰지 않음)
+        Post.query.filter_by(id=post_id).update(values, synchronize_session=False)
+        # 카테고리 카운터 이동 + 세대 번호 증가 (수정 내용이 ETag에 반영되도록)
+        PostCounter.record_moved(old_category, values['category'])
         db.session.commit()
+        pin_primary()
         
-        # 캐시 무효화
-        invalidate_cache(post.category)
+        # 캐시 무효화 (카테고리가 바뀐 경우 이전 카테고리도 포함)
+        if 'image_data' in values:
+            image_cache.invalidate_post(post_id)
+            image_cache.discard_renditions_async([post.image_hash])
+        invalidate_cache(values['category'])
+        if old_category != values['category']:
+            invalidate_cache(old_category)
         
         flash('글이 수정되었습니다!', 'success')
         
         # 카테고리에 따라 리다이렉트
-        if post.category == 'gallery':
-            return redirect(url_for('main.gallery_detail', post_id=post.id))
-        elif post.category in ['archive_1', 'archive_2']:
-            return redirect(url_for('main.archive', type_name=post.category))
+        category = values['category']
+        if category == 'gallery':
+            return redirect(url_for('main.gallery_detail', post_id=post_id))
+        elif category in ['archive_1', 'archive_2']:
+            return redirect(url_for('main.archive', type_name=category))
         else:
             return redirect(url_for('main.index'))
     
@@ -830,20 +1144,52 @@ def edit_post(post_id):
     
     return render_template('edit_post.html', form=form, post=post)
 
+def delete_posts(post_ids):
+    """게시글 여러 개를 한 트랜잭션으로 삭제 (이미지 데이터는 읽지 않음)
+
+    메타데이터 컬럼만 조회한 뒤 DELETE ... WHERE 로 지우고,
+    커밋 후 이미지 캐시/렌디션 파일 정리는 백그라운드로 넘긴다.
+
+    Returns:
+        삭제된 게시글의 카테고리 목록 (게시글 순서)
+    """
+    posts = db.session.query(Post.id, Post.category, Post.created_at, Post.image_hash).filter(
+        Post.id.in_(post_ids)).all()
+    if not posts:
+        return []
+    found_ids = [p.id for p in posts]
+    images = db.session.query(PostImage.id, PostImage.image_hash).filter(
+        PostImage.post_id.in_(found_ids)).all()
+    
+    for p in posts:
+        PostCounter.record_deleted(p.category, p.created_at)
+    # ON DELETE CASCADE가 없는 기존 DB(SQLite 등)도 고려해 추가 이미지를 먼저 삭제
+    PostImage.query.filter(PostImage.post_id.in_(found_ids)).delete(synchronize_session=False)
+    Post.query.filter(Post.id.in_(found_ids)).delete(synchronize_session=False)
+    db.session.commit()
+    pin_primary()
+    
+    # 캐시 무효화
+    image_ids = [img.id for img in images]
+    for post_id in found_ids:
+        image_cache.invalidate_post(post_id)
+    image_cache.invalidate_post(None, image_ids)
+    image_cache.discard_renditions_async([p.image_hash for p in posts] + [img.image_hash for img in images])
+    categories = [p.category for p in posts]
+    for category in set(categories):
+        invalidate_cache(category)
+    return categories
+
 @bp.route('/post/<int:post_id>/delete', methods=['POST'])
 @login_required
 def delete_post(post_id):
     if not current_user.is_admin():
         abort(403)
     
-    post = Post.query.get_or_404(post_id)
-    category = post.category
-    
-    db.session.delete(post)
-    db.session.commit()
-    
-    # 캐시 무효화
-    invalidate_cache(category)
+    categories = delete_posts([post_id])
+    if not categories:
+        abort(404)
+    category = categories[0]
     
     flash('글이 삭제되었습니다.', 'success')
     
@@ -855,6 +1201,30 @@ def delete_post(post_id):
     else:
         return redirect(url_for('main.index'))
 
+@bp.route('/admin/posts/delete', methods=['POST'])
+@login_required
+def bulk_delete_posts():
+    """게시글 일괄 삭제 (관리자 전용, post_ids: JSON 배열 또는 폼 필드 여러 개)"""
+    if not current_user.is_admin():
+        abort(403)
+    
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get('post_ids') if data else request.form.getlist('post_ids')
+    try:
+        post_ids = sorted({int(post_id) for post_id in raw_ids or []})
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'post_ids must be integers'}), 400
+    if not post_ids:
+        return jsonify({'success': False, 'message': 'post_ids is required'}), 400
+    
+    try:
+        categories = delete_posts(post_ids)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk delete failed: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+    return jsonify({'success': True, 'deleted': len(categories)})
+
 @bp.route('/admin/tistory/sync', methods=['POST'])
 @login_required
 def manual_tistory_sync():
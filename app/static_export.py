@@ -0,0 +1,340 @@
+"""
+공개 페이지 정적 내보내기 (flask --app index export-static --output build/site)
+
+홈, 갤러리/아카이브 목록, 상세 페이지, 이미지 렌디션과 static 파일을 정적 파일로 저장해
+정적 호스팅/CDN에서 바로 서빙할 수 있게 한다 (Flask 앱은 관리/작성/API 요청만 처리).
+
+쿼리 문자열은 정적 호스트에서 구분되지 않으므로 경로로 바꾼다.
+    /gallery?page=2        → /gallery/page/2/        (gallery/page/2/index.html)
+    /archive/archive_1/5   → /archive/archive_1/5/   (archive/archive_1/5/index.html)
+    /image/12?w=640        → /image/12/w640.webp     (정적 호스트는 Accept 협상이 안 되므로 WebP)
+    /image/12/download     → /image/12/image_12.<확장자>  (원본 MIME 타입 기준 확장자)
+
+증분 내보내기: 출력 폴더의 .export-manifest.json 에 파일별 지문을 저장하고
+  - 목록 페이지는 카테고리 세대 번호(PostCounter generation:<카테고리>)와 썸네일 이미지 해시/크기
+  - 상세 페이지는 게시글 updated_at / content_html 해시 / 대표·추가 이미지 해시와 크기 / 이전·다음 글 id
+    (render-content --all, recompress-images처럼 updated_at을 바꾸지 않는 작업도 반영)
+  - 이미지는 원본 내용 해시
+가 바뀐 파일만 다시 만든다. 삭제된 게시글의 파일은 지운다.
+템플릿이나 static 파일이 바뀌면(빌드 지문) 전체를 다시 만든다.
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.export-manifest.json'
+MANIFEST_VERSION = 1
+
+_URL_ATTRIBUTE = re.compile(r'(\s(?:href|src|srcset)=")([^"]*)(")')
+_IMAGE_PATH = re.compile(r'^/(image|post/image)/(\d+)(/download)?$')
+_DETAIL_PATH = re.compile(r'^/(gallery|archive/archive_[12])/(\d+)$')
+_LIST_PATH = re.compile(r'^/(gallery|archive/archive_[12])$')
+
+IMAGE_EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif', 'image/webp': 'webp'}
+
+
+def static_url(url, extensions=None):
+    """앱 URL을 정적 경로로 변환 (대상이 아니면 None)
+
+    extensions: 원본 다운로드 파일 확장자 ('/image/12' → 'png', 없으면 'jpg')
+    """
+    if not url.startswith('/') or url.startswith('//'):
+        return None
+    parts = urlsplit(url)
+    path, query = parts.path.rstrip('/') or '/', parse_qs(parts.query)
+    if path == '/':
+        return '/'
+    if _LIST_PATH.match(path):
+        if query.get('q', [''])[0]:
+            return None  # 검색은 Flask 앱이 처리
+        page = query.get('page', ['1'])[0]
+        return f'{path}/' if page in ('', '1') else f'{path}/page/{page}/'
+    if _DETAIL_PATH.match(path):
+        return f'{path}/'
+    match = _IMAGE_PATH.match(path)
+    if match:
+        if match.group(3):
+            source_path = path.removesuffix('/download')
+            ext = (extensions or {}).get(source_path, 'jpg')
+            return f'{source_path}/image_{match.group(2)}.{ext}'
+        width = query.get('w', [''])[0]
+        return f'{path}/w{width}.webp' if width.isdigit() else f'{path}/full.webp'
+    return None
+
+
+def _output_path(static_path):
+    """정적 URL 경로 → 출력 폴더 기준 파일 경로"""
+    rel = static_path.lstrip('/')
+    if not rel or rel.endswith('/'):
+        rel += 'index.html'
+    return rel
+
+
+def rewrite_urls(html, extensions=None):
+    """HTML의 href/src/srcset 속성 URL을 정적 경로로 바꾸고, 참조한 이미지 URL 목록 반환"""
+    images = set()
+
+    def convert(url):
+        target = static_url(url, extensions)
+        if target is None:
+            return url
+        if _IMAGE_PATH.match(urlsplit(url).path.rstrip('/')):
+            images.add(url)
+        return target
+
+    def replace(match):
+        value = match.group(2).replace('&amp;', '&')
+        if match.group(1).strip().startswith('srcset'):
+            candidates = []
+            for candidate in value.split(','):
+                pieces = candidate.strip().split(None, 1)
+                if pieces:
+                    pieces[0] = convert(pieces[0])
+                    candidates.append(' '.join(pieces))
+            new_value = ', '.join(candidates)
+        else:
+            new_value = convert(value)
+        return match.group(1) + new_value.replace('&', '&amp;') + match.group(3)
+
+    return _URL_ATTRIBUTE.sub(replace, html), images
+
+
+def build_fingerprint(app):
+    """템플릿/static 파일 지문 (바뀌면 전체 다시 내보내기)"""
+    digest = hashlib.sha256()
+    for folder in (app.template_folder, app.static_folder):
+        for root, dirs, files in os.walk(folder):
+            dirs[:] = sorted(d for d in dirs if d != 'uploads')
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                digest.update(f'{os.path.relpath(os.path.join(root, name), folder)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'build': None, 'language': None, 'files': {}, 'refs': {}}
+
+
+def _digest(*parts):
+    """지문 값 (긴 본문/이미지 목록을 짧은 해시로)"""
+    return hashlib.sha1(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+
+def _attached_images():
+    """게시글 id → 추가 이미지 [(id, 해시, 너비, 높이)] (표시 순서)"""
+    from . import db
+    from .models import PostImage
+
+    attached = {}
+    rows = db.session.query(PostImage.post_id, PostImage.id, PostImage.image_hash,
+                            PostImage.image_width, PostImage.image_height
+                            ).order_by(PostImage.post_id, PostImage.order, PostImage.id)
+    for row in rows:
+        attached.setdefault(row.post_id, []).append((row.id, row.image_hash, row.image_width, row.image_height))
+    return attached
+
+
+def _plan_pages(app):
+    """내보낼 페이지 목록 [(URL, 출력 경로, 지문)]"""
+    from flask import url_for
+    from sqlalchemy import func
+    from . import db
+    from .models import Post, PostCounter
+    from .routes import CATEGORIES
+
+    generations = PostCounter.get_many([f'generation:{c}' for c in CATEGORIES])
+    counts = dict(db.session.query(Post.category, func.count(Post.id)).group_by(Post.category).all())
+    per_page = {'gallery': 8, 'archive_1': 30, 'archive_2': 30}
+
+    attached = _attached_images()
+    pages = [(url_for('main.index'), _output_path('/'), json.dumps(generations, sort_keys=True))]
+    for category in CATEGORIES:
+        rows = db.session.query(Post.id, Post.created_at, Post.updated_at, Post.content_html, Post.image_hash,
+                                Post.image_width, Post.image_height).filter(
+            Post.category == category).order_by(Post.id).all()
+        images = {row.id: ((row.image_hash, row.image_width, row.image_height), attached.get(row.id, []))
+                  for row in rows}
+
+        # 목록 페이지 - 썸네일 크기 속성이 있으므로 이미지 해시/크기도 지문에 포함 (재압축 반영)
+        generation = str(generations.get(f'generation:{category}', 0))
+        list_digest = _digest(sorted(images.items()))
+        list_url = url_for('main.gallery') if category == 'gallery' else url_for('main.archive', type_name=category)
+        page_count = max(1, -(-counts.get(category, 0) // per_page[category]))
+        for page in range(1, page_count + 1):
+            url = list_url if page == 1 else f'{list_url}?page={page}'
+            pages.append((url, _output_path(static_url(url)), f'{generation}:{page_count}:{list_digest}'))
+
+        # 상세 페이지 - 이전/다음 글 링크가 있으므로 인접 id도 지문에 포함
+        for index, row in enumerate(rows):
+            prev_id = rows[index - 1].id if index > 0 else None
+            next_id = rows[index + 1].id if index + 1 < len(rows) else None
+            if category == 'gallery':
+                url = url_for('main.gallery_detail', post_id=row.id)
+            else:
+                url = url_for('main.archive_detail', type_name=category, post_id=row.id)
+            updated = (row.updated_at or row.created_at).isoformat() if (row.updated_at or row.created_at) else ''
+            fingerprint = _digest(updated, row.content_html, images[row.id], prev_id, next_id)
+            pages.append((url, _output_path(static_url(url)), fingerprint))
+    return pages
+
+
+def _backfill_image_columns():
+    """image_hash/크기가 비어 있는 이미지 채우기
+
+    렌디션 라우트가 첫 요청 때 채우는 값이지만, 내보내기 도중에 채워지면
+    페이지(srcset)와 지문이 다음 실행에서 다시 바뀌므로 미리 계산해 둔다.
+    """
+    from . import db
+    from .models import Post, PostImage
+    from .routes import image_columns
+
+    filled = 0
+    for model in (Post, PostImage):
+        rows = db.session.query(model.id).filter(model.image_data.isnot(None), model.image_hash.is_(None)).all()
+        for (object_id,) in rows:
+            source = db.session.query(model.image_data).filter_by(id=object_id).scalar()
+            model.query.filter_by(id=object_id).update(image_columns(bytes(source)), synchronize_session=False)
+            db.session.commit()
+            filled += 1
+    return filled
+
+
+def _image_sources():
+    """이미지 URL 경로('/image/12') → 원본 해시, 원본 다운로드 확장자
+
+    해시가 아직 없는 이미지(렌디션 첫 요청 전)는 id로 대신하므로 --full 로만 갱신된다.
+    """
+    from . import db
+    from .models import Post, PostImage
+
+    hashes, extensions = {}, {}
+    for row in db.session.query(Post.id, Post.image_hash, Post.image_mimetype).filter(Post.image_mimetype.isnot(None)):
+        path = f'/image/{row.id}'
+        hashes[path] = row.image_hash or f'post:{row.id}'
+        extensions[path] = IMAGE_EXTENSIONS.get(row.image_mimetype, 'jpg')
+    for row in db.session.query(PostImage.id, PostImage.image_hash):
+        hashes[f'/post/image/{row.id}'] = row.image_hash or f'post_image:{row.id}'
+    return hashes, extensions
+
+
+def _write(output_dir, rel_path, data):
+    from .assets import _write_file
+    path = os.path.join(output_dir, *rel_path.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_file(path, data)
+
+
+def _copy_static(app, output_dir, manifest, expected):
+    """static 폴더 복사 (크기/수정 시각이 바뀐 파일만)"""
+    copied = 0
+    for root, dirs, files in os.walk(app.static_folder):
+        dirs[:] = [d for d in dirs if d != 'uploads']
+        for name in files:
+            src = os.path.join(root, name)
+            rel = 'static/' + os.path.relpath(src, app.static_folder).replace(os.sep, '/')
+            stat = os.stat(src)
+            fingerprint = f'{stat.st_size}:{stat.st_mtime_ns}'
+            expected[rel] = fingerprint
+            if manifest['files'].get(rel) == fingerprint:
+                continue
+            dst = os.path.join(output_dir, *rel.split('/'))
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(src, dst)
+            copied += 1
+    return copied
+
+
+def export_site(app, output_dir, language='ko', full=False, echo=logger.info):
+    """공개 사이트를 output_dir에 내보내기 (증분)
+
+    Returns:
+        {'pages': 다시 만든 페이지 수, 'images': 다시 만든 이미지 수,
+         'static': 복사한 static 파일 수, 'removed': 삭제한 파일 수, 'skipped': 그대로 둔 파일 수}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    build = build_fingerprint(app)
+    previous = set(manifest['files'])
+    if full or manifest['build'] != build or manifest['language'] != language:
+        echo('템플릿/static 변경 또는 --full: 전체 내보내기')
+        manifest['files'], manifest['refs'] = {}, {}
+
+    totals = {'pages': 0, 'images': 0, 'static': 0, 'removed': 0, 'skipped': 0}
+    expected = {}  # 이번 내보내기 후 존재해야 하는 파일 → 지문
+    client = app.test_client()
+    page_headers = {'Accept': 'text/html', 'Accept-Language': language}
+
+    with app.test_request_context():
+        filled = _backfill_image_columns()
+        if filled:
+            echo(f'이미지 해시/크기 {filled}개 채움')
+        pages = _plan_pages(app)
+        image_hashes, extensions = _image_sources()
+
+    for url, rel_path, fingerprint in pages:
+        expected[rel_path] = fingerprint
+        if manifest['files'].get(rel_path) == fingerprint and rel_path in manifest['refs']:
+            totals['skipped'] += 1
+            continue
+        response = client.get(url, headers=page_headers)
+        if response.status_code != 200:
+            echo(f'{url}: HTTP {response.status_code} - 건너뜀')
+            expected.pop(rel_path)
+            continue
+        html, images = rewrite_urls(response.get_data(as_text=True), extensions)
+        _write(output_dir, rel_path, html.encode('utf-8'))
+        manifest['files'][rel_path] = fingerprint
+        manifest['refs'][rel_path] = sorted(images)
+        totals['pages'] += 1
+
+    # 페이지가 참조하는 이미지 (다시 만들지 않은 페이지의 참조도 포함)
+    image_urls = set()
+    for rel_path in expected:
+        image_urls.update(manifest['refs'].get(rel_path, []))
+    for url in sorted(image_urls):
+        source_path = urlsplit(url).path.rstrip('/').removesuffix('/download')
+        image_hash = image_hashes.get(source_path)
+        if image_hash is None:
+            continue
+        rel_path = _output_path(static_url(url, extensions))
+        expected[rel_path] = image_hash
+        if manifest['files'].get(rel_path) == image_hash:
+            totals['skipped'] += 1
+            continue
+        # 원본 다운로드는 그대로, 렌디션은 정적 호스트에서 협상이 안 되므로 WebP로 고정
+        response = client.get(url, headers={'Accept': 'image/webp'})
+        if response.status_code != 200:
+            expected.pop(rel_path)
+            continue
+        _write(output_dir, rel_path, response.get_data())
+        manifest['files'][rel_path] = image_hash
+        totals['images'] += 1
+
+    totals['static'] = _copy_static(app, output_dir, manifest, expected)
+
+    # 삭제된 게시글/페이지의 파일 정리
+    for rel_path in (previous | set(manifest['files'])) - set(expected):
+        try:
+            os.remove(os.path.join(output_dir, *rel_path.split('/')))
+        except OSError:
+            pass
+        manifest['refs'].pop(rel_path, None)
+        totals['removed'] += 1
+
+    manifest.update(build=build, language=language, files=expected,
+                    refs={k: v for k, v in manifest['refs'].items() if k in expected})
+    _write(output_dir, MANIFEST_NAME, json.dumps(manifest, sort_keys=True).encode('utf-8'))
+    return totals
@@ -0,0 +1,96 @@
+"""
+Jinja 바이트코드 캐시 (콜드 스타트 시 템플릿 컴파일 생략)
+
+워커가 새로 뜨거나 Vercel 콜드 스타트가 일어나면 첫 렌더링 때 base.html과 페이지 템플릿을
+파이썬 코드로 컴파일하는데, 컴파일 결과(바이트코드)를 파일로 저장해 두고 다시 사용한다.
+  - TEMPLATE_BYTECODE_DIR: flask --app index precompile-templates 로 미리 컴파일한 결과.
+    Vercel은 vercel.json의 buildCommand에서 배포마다 만들어 함수 번들에 포함한다
+    (빌드와 실행 환경의 파이썬 버전이 다르면 체크섬 확인에서 걸러져 다시 컴파일).
+    서버 환경에서는 실행 중 캐시도 이 폴더에 쓴다.
+  - TEMPLATE_BYTECODE_CACHE_DIR: 실행 중 캐시 폴더 (Vercel은 /tmp만 쓸 수 있으므로 /tmp 아래).
+    여기에 없으면 사전 컴파일 폴더에서 읽는다.
+캐시 항목은 템플릿 소스 체크섬과 파이썬 버전을 함께 저장하므로 템플릿이 바뀌거나
+파이썬 버전이 다르면 자동으로 다시 컴파일한다.
+"""
+import os
+import logging
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """실행 중 캐시 폴더 → 사전 컴파일 폴더 순서로 읽고, 실행 중 캐시 폴더에만 쓰는 바이트코드 캐시"""
+
+    def __init__(self, directory, precompiled_directory=None, strict=False):
+        super().__init__(directory, pattern='%s.jinja')
+        self.precompiled_directory = precompiled_directory
+        self.strict = strict  # True면 저장 실패를 그대로 전달 (사전 컴파일용)
+
+    def get_cache_key(self, name, filename=None):
+        # 기본 키는 템플릿 절대 경로를 포함해 빌드 환경과 배포 환경(/var/task)의 키가 달라지므로
+        # 템플릿 이름만 사용 (내용이 바뀐 경우는 소스 체크섬으로 걸러짐)
+        return super().get_cache_key(name)
+
+    def load_bytecode(self, bucket):
+        super().load_bytecode(bucket)
+        if bucket.code is None and self.precompiled_directory and self.precompiled_directory != self.directory:
+            path = os.path.join(self.precompiled_directory, self.pattern % bucket.key)
+            try:
+                with open(path, 'rb') as f:
+                    bucket.load_bytecode(f)
+            except OSError:
+                pass
+
+    def dump_bytecode(self, bucket):
+        # 읽기 전용 파일 시스템 등에서 저장에 실패해도 렌더링은 계속
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            if self.strict:
+                raise
+            logger.debug(f"템플릿 바이트코드 저장 실패: {str(e)}")
+
+
+def init_template_cache(app):
+    """바이트코드 캐시 설정 (jinja_env 생성 전에 호출해야 jinja_options로 적용됨)"""
+    config = app.config
+    if not config.get('TEMPLATE_BYTECODE_CACHE_ENABLED', True):
+        return
+    precompiled_dir = config.get('TEMPLATE_BYTECODE_DIR')
+    directory = config.get('TEMPLATE_BYTECODE_CACHE_DIR') or precompiled_dir
+    if not directory:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"템플릿 바이트코드 캐시 폴더 생성 실패: {str(e)}")
+        if not precompiled_dir or not os.path.isdir(precompiled_dir):
+            return
+        directory = precompiled_dir
+
+    bytecode_cache = TemplateBytecodeCache(directory, precompiled_dir)
+    if 'jinja_env' in app.__dict__:
+        app.jinja_env.bytecode_cache = bytecode_cache
+    else:
+        app.jinja_options = dict(app.jinja_options, bytecode_cache=bytecode_cache)
+
+
+def precompile_templates(app, directory=None):
+    """templates/의 모든 템플릿을 컴파일해 바이트코드 파일로 저장 (배포 전 빌드 단계)
+
+    Returns:
+        (컴파일한 템플릿 수, 저장 폴더)
+    """
+    directory = directory or app.config.get('TEMPLATE_BYTECODE_DIR')
+    os.makedirs(directory, exist_ok=True)
+    bytecode_cache = TemplateBytecodeCache(directory, strict=True)
+    env = app.jinja_env
+    count = 0
+    for name in env.list_templates():
+        source, filename, _ = env.loader.get_source(env, name)
+        bucket = bytecode_cache.get_bucket(env, name, filename, source)
+        bucket.code = env.compile(source, name, filename)
+        bytecode_cache.set_bucket(bucket)
+        count += 1
+    return count, directory
@@ -112,11 +112,33 @@ def parse_tistory_rss(rss_url):
         return []
 
 
+def fetch_image_placeholder(post, max_bytes=2 * 1024 * 1024):
+    """티스토리 썸네일을 받아 저화질 미리보기 / 대표 색 계산 (실패 시 (None, None))
+
+    목록에 표시되는 것과 같은 썸네일 서버 이미지(160x108)를 사용하므로 원본을 받지 않는다.
+    """
+    from .imaging import placeholder
+    
+    thumbnail_url = post.get_thumbnail_url()
+    if not thumbnail_url:
+        return None, None
+    try:
+        response = requests.get(thumbnail_url, timeout=5)
+        response.raise_for_status()
+        if len(response.content) > max_bytes:
+            return None, None
+        return placeholder(response.content)
+    except Exception as e:
+        logger.warning(f"티스토리 썸네일 미리보기 생성 실패: {str(e)}")
+        return None, None
+
+
 def sync_tistory_posts(app, rss_url, default_category='gallery', author_id=None):
     """티스토리 RSS에서 새 글을 가져와서 Post로 생성"""
     with app.app_context():
-        from .models import Post, User
-        from . import db, cache
+        from .models import Post, User, PostCounter
+        from .content import content_html_for
+        from . import db
         
         try:
             # RSS 피드 파싱
@@ -163,6 +185,7 @@ def sync_tistory_posts(app, rss_url, default_category='gallery', author_id=None)
                 post = Post(
                     title=tistory_post['title'][:100],  # 제목 길이 제한
                     content=tistory_post['content'],
+                    content_html=content_html_for(tistory_post['content']),
                     category=default_category,
                     image_url=tistory_post['image_url'],
                     image_data=None,
@@ -172,20 +195,19 @@ def sync_tistory_posts(app, rss_url, default_category='gallery', author_id=None)
                     tistory_link=tistory_post['link'],
                     created_at=tistory_post['published_time']
                 )
+                post.image_placeholder, post.image_color = fetch_image_placeholder(post)
                 
                 db.session.add(post)
+                PostCounter.record_created(default_category, post.created_at)
                 new_posts_count += 1
                 logger.info(f"새 티스토리 글 추가: {tistory_post['title']}")
             
             if new_posts_count > 0:
                 db.session.commit()
                 
-                # 캐시 무효화
-                cache.delete('index_gallery_posts')
-                for i in range(1, 11):
-                    cache.delete(f'gallery_posts_page_{i}')
-                    cache.delete(f'archive_archive_1_page_{i}')
-                    cache.delete(f'archive_archive_2_page_{i}')
+                # 캐시 무효화 (홈 화면 최근 스케줄 + 해당 카테고리 목록)
+                from .routes import invalidate_cache
+                invalidate_cache(default_category)
                 
                 logger.info(f"티스토리 동기화 완료: {new_posts_count}개의 새 글이 추가되었습니다.")
             else:
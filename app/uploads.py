@@ -0,0 +1,216 @@
+"""
+업로드 처리 (디스크 스풀 + 이어 올리기 가능한 분할 업로드)
+
+1) 일반 multipart 업로드: 파일 부분은 UPLOAD_SPOOL_MAX_MEMORY 바이트까지만 메모리에 두고
+   그 이상은 임시 파일로 넘기는 SpooledTemporaryFile에 받는다 (SpooledRequest).
+   save_picture는 이 파일 스트림에서 바로 디코딩하므로 원본 전체를 bytes로 읽지 않는다.
+2) 분할 업로드: 큰 이미지 여러 장을 한 요청에 보내지 않도록
+     POST /upload                 → 업로드 시작 (upload_id 발급)
+     PUT  /upload/<id>?offset=N   → 요청 본문(조각)을 이어 쓰기 (offset이 다르면 409 + 현재 위치)
+     GET  /upload/<id>            → 현재까지 받은 바이트 수 (중단 후 이어 올리기용)
+     POST /upload/<id>/complete   → sha256 확인 + 이미지 헤더/픽셀 수 검증
+   완료된 업로드는 new_post / edit_post에 upload_ids 필드로 넘기면 첨부 파일처럼 처리된다.
+   조각 파일은 UPLOAD_FOLDER/chunks 에 저장되며 UPLOAD_CHUNK_TTL이 지나면 정리한다.
+"""
+import os
+import json
+import time
+import uuid
+import hashlib
+import tempfile
+import logging
+from contextlib import contextmanager
+from flask import Request, current_app
+from werkzeug.datastructures import FileStorage
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class SpooledRequest(Request):
+    """multipart 파일을 설정된 크기 이상이면 디스크에 스풀하는 Request"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        return tempfile.SpooledTemporaryFile(
+            max_size=config.get('UPLOAD_SPOOL_MAX_MEMORY', 512 * 1024),
+            mode='rb+',
+            dir=config.get('UPLOAD_SPOOL_DIR'),
+        )
+
+
+class UploadError(Exception):
+    """분할 업로드 오류 (status: HTTP 상태 코드)"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def chunk_dir():
+    directory = os.path.join(current_app.config['UPLOAD_FOLDER'], 'chunks')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _paths(upload_id):
+    # upload_id는 uuid4 hex만 허용 (경로 조작 방지)
+    if not upload_id or len(upload_id) != 32 or not all(c in '0123456789abcdef' for c in upload_id):
+        raise UploadError('Invalid upload id', status=404)
+    base = os.path.join(chunk_dir(), upload_id)
+    return base + '.part', base + '.json'
+
+
+def _load_meta(upload_id, user_id):
+    part_path, meta_path = _paths(upload_id)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        raise UploadError('Upload not found', status=404)
+    if meta.get('user_id') != user_id:
+        raise UploadError('Upload not found', status=404)
+    return meta, part_path, meta_path
+
+
+def _save_meta(meta_path, meta):
+    tmp_path = f'{meta_path}.tmp{os.getpid()}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def start_upload(user_id, filename, size, content_type):
+    """분할 업로드 시작 - upload_id 반환"""
+    max_bytes = current_app.config.get('CHUNKED_UPLOAD_MAX_BYTES', 64 * 1024 * 1024)
+    if not size or size <= 0 or size > max_bytes:
+        raise UploadError(f'File size must be between 1 and {max_bytes} bytes', status=413)
+    if not (content_type or '').startswith('image/'):
+        raise UploadError('Only image uploads are allowed', status=415)
+    cleanup_expired()
+
+    upload_id = uuid.uuid4().hex
+    part_path, meta_path = _paths(upload_id)
+    open(part_path, 'wb').close()
+    _save_meta(meta_path, {
+        'user_id': user_id,
+        'filename': os.path.basename(filename or 'upload'),
+        'content_type': content_type,
+        'size': size,
+        'complete': False,
+        'created_at': time.time(),
+    })
+    return upload_id
+
+
+def upload_status(upload_id, user_id):
+    meta, part_path, _ = _load_meta(upload_id, user_id)
+    return {
+        'upload_id': upload_id,
+        'offset': os.path.getsize(part_path),
+        'size': meta['size'],
+        'complete': meta['complete'],
+    }
+
+
+def append_chunk(upload_id, user_id, offset, stream):
+    """offset 위치에 조각 이어 쓰기 (요청 본문을 블록 단위로 복사). 새 offset 반환"""
+    meta, part_path, _ = _load_meta(upload_id, user_id)
+    if meta['complete']:
+        raise UploadError('Upload already completed', status=409, offset=meta['size'])
+    current = os.path.getsize(part_path)
+    if offset != current:
+        # 중간에 끊긴 경우 클라이언트가 이 위치부터 다시 보냄
+        raise UploadError('Offset mismatch', status=409, offset=current)
+
+    written = current
+    with open(part_path, 'ab') as f:
+        while True:
+            block = stream.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            written += len(block)
+            if written > meta['size']:
+                f.truncate(current)
+                raise UploadError('Chunk exceeds declared file size', status=413, offset=current)
+            f.write(block)
+    return written
+
+
+def complete_upload(upload_id, user_id, expected_sha256=None):
+    """모든 조각을 받았는지, 내용 해시와 이미지 헤더가 올바른지 확인"""
+    from .imaging import open_image
+
+    meta, part_path, meta_path = _load_meta(upload_id, user_id)
+    received = os.path.getsize(part_path)
+    if received != meta['size']:
+        raise UploadError('Upload is incomplete', status=409, offset=received)
+
+    digest = hashlib.sha256()
+    with open(part_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    if expected_sha256 and expected_sha256.lower() != digest.hexdigest():
+        raise UploadError('Checksum mismatch', status=422)
+
+    try:
+        with open(part_path, 'rb') as f:
+            open_image(f, current_app.config.get('IMAGE_MAX_PIXELS')).verify()
+    except Exception as e:
+        discard_uploads([upload_id], user_id)
+        raise UploadError(f'Invalid image: {str(e)}', status=415)
+
+    meta['complete'] = True
+    meta['sha256'] = digest.hexdigest()
+    _save_meta(meta_path, meta)
+    return {'upload_id': upload_id, 'size': received, 'sha256': meta['sha256']}
+
+
+@contextmanager
+def open_uploads(upload_ids, user_id):
+    """완료된 업로드를 FileStorage 목록으로 열기 (request.files와 같은 방식으로 사용)
+
+    with 블록을 나가면 (검증 실패로 일찍 반환하거나 예외가 나도) 열어 둔 파일을 모두 닫는다.
+    """
+    files = []
+    try:
+        for upload_id in upload_ids:
+            meta, part_path, _ = _load_meta(upload_id, user_id)
+            if not meta['complete']:
+                raise UploadError('Upload is incomplete', status=409)
+            files.append(FileStorage(
+                stream=open(part_path, 'rb'),
+                filename=meta['filename'],
+                content_type=meta['content_type'],
+            ))
+        yield files
+    finally:
+        for file in files:
+            file.close()
+
+
+def discard_uploads(upload_ids, user_id=None):
+    """업로드 파일 삭제 (게시글 저장 후 또는 검증 실패 시)"""
+    for upload_id in upload_ids:
+        try:
+            if user_id is not None:
+                _load_meta(upload_id, user_id)
+            for path in _paths(upload_id):
+                if os.path.exists(path):
+                    os.remove(path)
+        except (UploadError, OSError):
+            pass
+
+
+def cleanup_expired():
+    """UPLOAD_CHUNK_TTL이 지난 업로드 정리"""
+    ttl = current_app.config.get('UPLOAD_CHUNK_TTL', 24 * 3600)
+    cutoff = time.time() - ttl
+    try:
+        for entry in os.scandir(chunk_dir()):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+    except OSError as e:
+        logger.warning(f"분할 업로드 정리 실패: {str(e)}")
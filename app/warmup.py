@@ -0,0 +1,138 @@
+"""
+캐시 예열 (warm-up)
+
+글 작성/수정/삭제, 티스토리 동기화 또는 앱 시작 직후 첫 방문자가 쿼리와 렌더링 비용을
+모두 부담하지 않도록 홈, 각 카테고리 목록의 첫 K 페이지, 최신 이미지의 주요 크기를
+백그라운드에서 미리 요청해 둔다.
+
+앱 시작 시 예열(schedule_startup_warmup)은 서버로 실행할 때만 한다 - flask CLI 명령
+(마이그레이션, precompile-templates, render-content, export-static 등)도 create_app()을
+호출하지만 요청을 받지 않으므로 예열하지 않는다.
+
+실제 라우트를 테스트 클라이언트로 호출하므로 gallery()/archive()와 같은 캐시 키
+규칙(page_cache_key)과 같은 ETag/압축 경로를 그대로 사용한다.
+"""
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_running = False
+_pending = set()
+
+
+def warmup_urls(app, categories=None, pages=None, image_limit=None):
+    """예열할 URL 목록 (홈, 목록 페이지, 최신 이미지 렌디션)"""
+    from flask import url_for
+    from .models import Post
+    from .routes import CATEGORIES
+
+    categories = categories or CATEGORIES
+    pages = pages or app.config.get('CACHE_WARMUP_PAGES', 3)
+    image_limit = app.config.get('CACHE_WARMUP_IMAGES', 8) if image_limit is None else image_limit
+    widths = app.config.get('CACHE_WARMUP_IMAGE_WIDTHS', [1500])
+
+    urls = []
+    with app.test_request_context():
+        urls.append(url_for('main.index'))
+        for category in categories:
+            for page in range(1, pages + 1):
+                if category == 'gallery':
+                    urls.append(url_for('main.gallery', page=page))
+                elif category in ['archive_1', 'archive_2']:
+                    urls.append(url_for('main.archive', type_name=category, page=page))
+
+        if image_limit and 'gallery' in categories:
+            # 이미지 데이터는 로드하지 않고 id만 조회
+            post_ids = [row.id for row in Post.query.with_entities(Post.id).filter(
+                Post.category == 'gallery',
+                Post.image_mimetype.isnot(None)
+            ).order_by(Post.created_at.desc()).limit(image_limit)]
+            for post_id in post_ids:
+                for width in widths:
+                    urls.append(url_for('main.get_image', post_id=post_id, w=width))
+    return urls
+
+
+def warm_cache(app, categories=None, pages=None, image_limit=None):
+    """예열 실행 (동기). 요청한 URL 수와 실패 수 반환"""
+    languages = app.config.get('CACHE_WARMUP_LANGUAGES', ['ko'])
+    try:
+        urls = warmup_urls(app, categories, pages, image_limit)
+    except Exception as e:
+        logger.warning(f"캐시 예열 URL 생성 실패: {str(e)}")
+        return 0, 0
+
+    client = app.test_client()
+    headers = {
+        'Accept': 'text/html,image/avif,image/webp,*/*',
+        'Accept-Encoding': 'br, gzip',
+    }
+    requested = failed = 0
+    for lang in languages:
+        # 익명 방문자와 같은 방식(Accept-Language)으로 언어 지정 - 세션 쿠키 없이
+        lang_headers = dict(headers, **{'Accept-Language': lang})
+        for url in urls:
+            try:
+                response = client.get(url, headers=lang_headers)
+                # 스트리밍 응답은 본문을 끝까지 읽어야 렌더링이 끝나고 캐시에 저장됨
+                response.get_data()
+                response.close()
+                requested += 1
+                if response.status_code >= 400:
+                    failed += 1
+            except Exception as e:
+                requested += 1
+                failed += 1
+                logger.warning(f"캐시 예열 실패 ({url}): {str(e)}")
+    logger.info(f"캐시 예열 완료: {requested}개 요청, 실패 {failed}개")
+    return requested, failed
+
+
+def schedule_warmup(app, categories=None):
+    """백그라운드 스레드에서 예열 (이미 실행 중이면 끝난 뒤 한 번 더 실행)"""
+    from .routes import CATEGORIES
+
+    global _running
+    if not app.config.get('CACHE_WARMUP_ENABLED', False) or app.testing:
+        return
+    with _lock:
+        _pending.update(categories or CATEGORIES)
+        if _running:
+            return
+        _running = True
+
+    def run():
+        global _running
+        while True:
+            with _lock:
+                if not _pending:
+                    _running = False
+                    return
+                todo = sorted(_pending)
+                _pending.clear()
+            warm_cache(app, categories=todo)
+
+    threading.Thread(target=run, name='cache-warmup', daemon=True).start()
+
+
+def is_cli_command():
+    """flask CLI 명령으로 앱을 만든 경우 (flask run은 서버이므로 제외)
+
+    flask CLI는 click 컨텍스트 안에서 앱을 만든다. 사용자 정의 명령은 명령을 찾는 단계
+    (그룹 컨텍스트)에서, flask run은 run 명령 컨텍스트에서 앱을 만든다.
+    gunicorn, Vercel, python index.py 로 실행하면 click 컨텍스트가 없다.
+    """
+    import click
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return False
+    return ctx.command.name != 'run'
+
+
+def schedule_startup_warmup(app):
+    """배포/재시작 직후 예열 (서버 시작일 때만)"""
+    if is_cli_command():
+        return
+    schedule_warmup(app)
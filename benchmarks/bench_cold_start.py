@@ -0,0 +1,111 @@
+"""
+콜드 스타트 첫 요청 시간 벤치마크 (Jinja 바이트코드 캐시 유무)
+
+사용 예:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py 5       # 변형별 반복 횟수
+
+매 실행마다 새 프로세스(spawn)에서 create_app() 후 각 페이지를 처음 요청하는 시간을 잰다.
+  - compile:     바이트코드 캐시 없음 (첫 렌더링마다 base.html + 페이지 템플릿 컴파일)
+  - precompiled: precompile-templates 결과만 있고 실행 중 캐시 폴더는 비어 있음 (Vercel /tmp 콜드 스타트)
+같은 프로세스에서 두 번째 요청부터는 Jinja 메모리 캐시를 쓰므로 차이는 첫 요청에만 나타난다.
+"""
+import os
+import sys
+import time
+import tempfile
+import statistics
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PATHS = ['/', '/gallery', '/archive/archive_1', '/gallery/1']
+
+
+def make_config(db_path, cache_enabled, precompiled_dir, runtime_dir):
+    from config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+        CACHE_TYPE = 'NullCache'
+        PAGE_CACHE_LOCAL_MAX_BYTES = 0
+        CACHE_WARMUP_ENABLED = False
+        TEMPLATE_BYTECODE_CACHE_ENABLED = cache_enabled
+        TEMPLATE_BYTECODE_DIR = precompiled_dir
+        TEMPLATE_BYTECODE_CACHE_DIR = runtime_dir
+
+    return BenchConfig
+
+
+def run(args, queue):
+    """새 프로세스에서 앱 생성 + 페이지별 첫 요청 시간 (ms)"""
+    import logging
+    logging.disable(logging.WARNING)  # SQLite에서 나오는 Postgres 마이그레이션 경고 생략
+    from app import create_app
+
+    start = time.perf_counter()
+    app = create_app(make_config(*args))
+    timings = {'create_app': (time.perf_counter() - start) * 1000}
+    client = app.test_client()
+    for path in PATHS:
+        start = time.perf_counter()
+        client.get(path, headers={'Accept-Language': 'ko'}).get_data()
+        timings[path] = (time.perf_counter() - start) * 1000
+    queue.put(timings)
+
+
+def seed(db_path, precompiled_dir):
+    from datetime import datetime
+    from app import create_app, db
+    from app.models import User, Post
+    from app.template_cache import precompile_templates
+
+    app = create_app(make_config(db_path, False, precompiled_dir, None))
+    with app.app_context():
+        user = User(id='bench', email='bench@example.com', name='Bench', role='admin')
+        db.session.add(user)
+        for i in range(10):
+            db.session.add(Post(title=f'bench {i}', content='<p>본문</p>' * 50,
+                                category=('gallery', 'archive_1')[i % 2],
+                                author=user, created_at=datetime.utcnow()))
+        db.session.commit()
+    count, _ = precompile_templates(app, precompiled_dir)
+    return count
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'bench.db')
+    precompiled_dir = os.path.join(workdir, 'precompiled')
+    count = seed(db_path, precompiled_dir)
+
+    variants = {
+        'compile': lambda i: (db_path, False, precompiled_dir, None),
+        # 실행마다 비어 있는 실행 중 캐시 폴더 사용 (사전 컴파일 결과만 읽음)
+        'precompiled': lambda i: (db_path, True, precompiled_dir, os.path.join(workdir, f'runtime_{i}')),
+    }
+    ctx = multiprocessing.get_context('spawn')
+    results = {name: [] for name in variants}
+    for i in range(repeat):
+        for name, make_args in variants.items():
+            queue = ctx.Queue()
+            proc = ctx.Process(target=run, args=(make_args(i), queue))
+            proc.start()
+            results[name].append(queue.get())
+            proc.join()
+
+    print(f'템플릿 {count}개 사전 컴파일, 새 프로세스 {repeat}회 중앙값 (ms)')
+    columns = ['create_app'] + PATHS
+    print(f"{'':<12}" + ''.join(f'{c:>20}' for c in columns) + f"{'합계':>10}")
+    medians = {}
+    for name, runs in results.items():
+        medians[name] = {c: statistics.median(r[c] for r in runs) for c in columns}
+        total = sum(medians[name].values())
+        print(f'{name:<12}' + ''.join(f'{medians[name][c]:>20.1f}' for c in columns) + f'{total:>10.1f}')
+    before, after = sum(medians['compile'].values()), sum(medians['precompiled'].values())
+    print(f'-> 첫 요청까지 {before - after:.1f}ms 단축 ({after / before * 100:.0f}%)')
+
+
+if __name__ == '__main__':
+    main()
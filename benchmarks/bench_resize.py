@@ -0,0 +1,110 @@
+"""
+이미지 리사이즈 벤치마크 (기존 방식 vs app/imaging.py 리사이즈 엔진)
+
+사용 예:
+    python benchmarks/bench_resize.py ~/Pictures/phone_photos
+    python benchmarks/bench_resize.py            # 사진 폴더가 없으면 12MP 합성 JPEG 사용
+
+크기별로 각 방식을 별도 프로세스에서 실행해 소요 시간과 최대 메모리(peak RSS)를 비교한다.
+draft()는 1/2, 1/4, 1/8 배율만 가능하므로 목표 크기가 원본의 절반보다 클 때는 차이가 작다.
+실제 휴대폰 사진(4032x3024 등 JPEG/HEIC 변환본)을 넣어야 의미 있는 결과가 나온다.
+"""
+import os
+import io
+import sys
+import time
+import glob
+import resource
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# save_picture(상세용 2500px, 썸네일 800x1200)와 get_image(?w=1500, ?w=320)에서 쓰는 크기
+TARGETS = [(2500, 2500), (800, 1200), (1500, None), (320, None)]
+
+
+def legacy_resize(data, max_w, max_h):
+    """기존 경로: 원본 해상도로 모두 디코딩 후 LANCZOS"""
+    from PIL import Image
+    img = Image.open(io.BytesIO(data))
+    orig_w, orig_h = img.size
+    ratio = min(max_w / orig_w, max_h / orig_h) if max_h else max_w / orig_w
+    if ratio < 1.0:
+        img = img.resize((int(orig_w * ratio), int(orig_h * ratio)), Image.Resampling.LANCZOS)
+    else:
+        img.load()
+    return img
+
+
+def engine_resize(data, max_w, max_h):
+    """새 경로: draft() + reduce() + LANCZOS"""
+    from app.imaging import load_resized
+    img, _ = load_resized(data, max_w, max_h)
+    img.load()
+    return img
+
+
+def run(variant, target, paths, queue):
+    # 두 방식 모두 같은 모듈을 import해 기본 메모리 사용량을 맞춤
+    import app.imaging  # noqa: F401
+    func = legacy_resize if variant == 'legacy' else engine_resize
+    max_w, max_h = target
+    files = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            files.append(f.read())
+    start = time.perf_counter()
+    for data in files:
+        img = func(data, max_w, max_h)
+        img.save(io.BytesIO(), format='JPEG', quality=85)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_kb //= 1024
+    queue.put((elapsed, peak_kb))
+
+
+def synthesize(directory, count=4):
+    """사진 폴더가 없을 때 사용할 12MP 노이즈 JPEG 생성"""
+    from PIL import Image
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'synthetic_{i}.jpg')
+        Image.effect_noise((4032, 3024), 64 + i * 16).convert('RGB').save(path, 'JPEG', quality=92)
+        paths.append(path)
+    return paths
+
+
+def main():
+    if len(sys.argv) > 1:
+        paths = sorted(
+            p for p in glob.glob(os.path.join(sys.argv[1], '*'))
+            if p.lower().endswith(('.jpg', '.jpeg', '.png', '.webp'))
+        )
+    else:
+        paths = synthesize(tempfile.mkdtemp())
+    if not paths:
+        print('이미지 파일이 없습니다.')
+        return
+
+    ctx = multiprocessing.get_context('spawn')
+    print(f'{len(paths)}개 이미지')
+    print(f"{'크기':<12} {'방식':<8} {'시간(초)':>10} {'peak RSS(MB)':>14}")
+    for target in TARGETS:
+        results = {}
+        for variant in ('legacy', 'engine'):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=run, args=(variant, target, paths, queue))
+            proc.start()
+            results[variant] = queue.get()
+            proc.join()
+        label = f'{target[0]}x{target[1] or "-"}'
+        for variant, (elapsed, peak_kb) in results.items():
+            print(f'{label:<12} {variant:<8} {elapsed:>10.2f} {peak_kb / 1024:>14.1f}')
+        legacy, engine = results['legacy'], results['engine']
+        print(f'{"":<12} -> 속도 {legacy[0] / engine[0]:.1f}배, peak RSS {(engine[1] - legacy[1]) / 1024:+.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
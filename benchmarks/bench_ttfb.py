@@ -0,0 +1,130 @@
+"""
+스트리밍 렌더링 TTFB 벤치마크 (아카이브 목록/상세, 갤러리 상세)
+
+사용 예:
+    python benchmarks/bench_ttfb.py                # 게시글 60개, 본문 20KB
+    python benchmarks/bench_ttfb.py 120 50000      # 게시글 수, 본문 크기(바이트)
+
+임시 SQLite DB에 긴 본문을 가진 게시글을 만든 뒤 로컬 HTTP 서버로 요청해
+  - TTFB: 요청을 보낸 뒤 응답 헤더/첫 바이트가 도착할 때까지
+  - 전체: 본문을 끝까지 받을 때까지
+를 STREAM_CHUNK_SIZE=4096(스트리밍)과 아주 큰 값(페이지 전체를 모아 한 번에 전송 = 기존 방식)으로 비교한다.
+페이지 캐시는 끄고(NullCache) 매 요청 렌더링 비용을 측정한다.
+DB 조회는 두 방식 모두 첫 바이트 전에 끝나므로 차이는 템플릿 렌더링 시간(본문이 길수록 큼)에서 나온다.
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+import logging
+import statistics
+import http.client
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPEAT = 20
+VARIANTS = [('buffered', 10 ** 9), ('streamed', 4096)]
+
+
+def make_app(chunk_size, db_path):
+    from config import Config
+    from app import create_app
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+        CACHE_TYPE = 'NullCache'
+        PAGE_CACHE_LOCAL_MAX_BYTES = 0
+        COMPRESS_ENABLED = False
+        CACHE_WARMUP_ENABLED = False
+        STREAM_CHUNK_SIZE = chunk_size
+
+    return create_app(BenchConfig)
+
+
+def seed(app, count, content_bytes):
+    """긴 HTML 본문(티스토리 글과 비슷한 <p>/<img> 반복)을 가진 게시글 생성"""
+    from app import db
+    from app.models import User, Post
+
+    paragraph = '<p>{}</p><img src="https://blog.kakaocdn.net/dn/bench/{}.jpg">'
+    with app.app_context():
+        if Post.query.first() is not None:
+            return
+        user = User(id='bench', email='bench@example.com', name='Bench', role='admin')
+        db.session.add(user)
+        now = datetime.utcnow()
+        for i in range(count):
+            body, n = [], 0
+            while sum(len(p) for p in body) < content_bytes:
+                body.append(paragraph.format('가나다라마바사 ' * 20, n))
+                n += 1
+            category = ('archive_1', 'gallery')[i % 2]
+            db.session.add(Post(title=f'bench {i}', content=''.join(body), category=category,
+                                author=user, created_at=now - timedelta(minutes=i)))
+        db.session.commit()
+
+
+def measure(port, path):
+    """(TTFB, 전체 시간, 응답 크기)"""
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    start = time.perf_counter()
+    conn.request('GET', path, headers={'Accept-Language': 'ko'})
+    response = conn.getresponse()
+    response.read(1)
+    ttfb = time.perf_counter() - start
+    size = 1 + len(response.read())
+    total = time.perf_counter() - start
+    conn.close()
+    return ttfb, total, size
+
+
+def run(variant, chunk_size, db_path, paths):
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # 요청 로그 생략
+    app = make_app(chunk_size, db_path)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    results = {}
+    try:
+        for path in paths:
+            measure(server.port, path)  # 템플릿 컴파일/연결 준비
+            samples = [measure(server.port, path) for _ in range(REPEAT)]
+            results[path] = (
+                statistics.median(s[0] for s in samples),
+                statistics.median(s[1] for s in samples),
+                samples[0][2],
+            )
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    content_bytes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    seed(make_app(4096, db_path), count, content_bytes)
+    with make_app(4096, db_path).app_context():
+        from app.models import Post
+        archive_id = Post.query.filter_by(category='archive_1').first().id
+        gallery_id = Post.query.filter_by(category='gallery').first().id
+    paths = ['/archive/archive_1', f'/archive/archive_1/{archive_id}', f'/gallery/{gallery_id}']
+
+    print(f'게시글 {count}개, 본문 {content_bytes / 1024:.0f}KB, 요청 {REPEAT}회 중앙값')
+    print(f"{'경로':<28} {'방식':<9} {'TTFB(ms)':>9} {'전체(ms)':>9} {'크기(KB)':>9}")
+    results = {variant: run(variant, chunk_size, db_path, paths) for variant, chunk_size in VARIANTS}
+    for path in paths:
+        for variant, _ in VARIANTS:
+            ttfb, total, size = results[variant][path]
+            print(f'{path:<28} {variant:<9} {ttfb * 1000:>9.1f} {total * 1000:>9.1f} {size / 1024:>9.1f}')
+        buffered, streamed = results['buffered'][path], results['streamed'][path]
+        print(f'{"":<28} -> 스트리밍 TTFB = 기존의 {streamed[0] / buffered[0] * 100:.0f}%')
+
+
+if __name__ == '__main__':
+    main()
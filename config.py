@@ -21,19 +21,78 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('POSTGRES_URL') or os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,  # 연결 유효성 검사
-        'pool_recycle': 300,     # 연결 재사용 시간
-    }
+    # 읽기 전용 복제본 (설정하면 공개 조회 라우트의 SELECT를 복제본으로 보냄, app/db_routing.py)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_CHECK_INTERVAL = 5  # 복제 지연 확인 주기 (초, 워커 프로세스별)
+    REPLICA_READ_YOUR_WRITES_SECONDS = 10  # 글 작성/수정/삭제 후 작성자가 primary에서 읽는 시간 (초)
+    # 추가 엔진 옵션 (풀 관련 옵션은 DB_POOL_PROFILE이 custom이 아니면 아래 설정으로 덮어씀)
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # DB 연결 풀 프로필 (app/db_pool.py)
+    #   serverless: 요청마다 연결 (NullPool, pgbouncer 트랜잭션 모드 호환)
+    #   server: QueuePool (LIFO, pre-ping 없이 끊김 오류 후 재연결)
+    #   custom: SQLALCHEMY_ENGINE_OPTIONS 그대로 사용
+    DB_POOL_PROFILE = os.environ.get('DB_POOL_PROFILE') or ('serverless' if is_vercel_environment() else 'server')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = 10  # 풀이 가득 찼을 때 기다리는 최대 시간 (초)
+    DB_POOL_RECYCLE = 1800  # 이 시간(초)보다 오래된 연결은 다시 연결 (DB/프록시 유휴 연결 종료 시간보다 짧게)
     
     # 정적 파일( CSS / JS / 이미지 ) 브라우저 캐싱 강화
     # 한 번 받아온 후에는 1년 동안 다시 받지 않도록 해 로딩 체감 속도를 개선
     SEND_FILE_MAX_AGE_DEFAULT = 31536000  # 초 단위 (365일)
     
     # 캐싱 설정
-    CACHE_TYPE = 'SimpleCache'  # 로컬 메모리 캐시 (프로덕션에서는 Redis 권장)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')  # 로컬 메모리 캐시 (프로덕션에서는 'RedisCache' 권장)
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or os.environ.get('REDIS_URL')
     CACHE_DEFAULT_TIMEOUT = 300  # 5분
     
+    # 목록 페이지 캐시 (stale-while-revalidate)
+    PAGE_CACHE_SOFT_TTL = 120  # 이 시간이 지나면 한 요청만 다시 렌더링하고 나머지는 기존 항목 사용
+    PAGE_CACHE_HARD_TTL = 600  # 캐시에서 완전히 삭제되는 시간
+    PAGE_CACHE_LOCK_TTL = 30  # 갱신 임대(lease) 유지 시간
+    PAGE_CACHE_WAIT_TIMEOUT = 2.0  # 항목이 없을 때 다른 요청의 렌더링을 기다리는 최대 시간 (초)
+    # 공유 캐시 앞단의 프로세스 메모리 LRU 계층 (SimpleCache는 이미 프로세스 메모리이므로 기본 비활성화)
+    PAGE_CACHE_LOCAL_MAX_BYTES = int(os.environ.get(
+        'PAGE_CACHE_LOCAL_MAX_BYTES', '0' if CACHE_TYPE == 'SimpleCache' else str(32 * 1024 * 1024)
+    ))
+    PAGE_CACHE_LOCAL_MAX_ENTRY_BYTES = 2 * 1024 * 1024  # 페이지 하나의 최대 크기
+    PAGE_CACHE_LOCAL_TTL = 10  # 로컬 계층 유효 시간 (초)
+    
+    # Jinja 템플릿 바이트코드 캐시 (콜드 스타트 시 템플릿 컴파일 생략)
+    TEMPLATE_BYTECODE_CACHE_ENABLED = os.environ.get('TEMPLATE_BYTECODE_CACHE_ENABLED', 'True').lower() == 'true'
+    # precompile-templates 결과 폴더 (배포에 포함) - 서버 환경에서는 실행 중 캐시도 여기에 저장
+    TEMPLATE_BYTECODE_DIR = os.environ.get('TEMPLATE_BYTECODE_DIR') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'jinja_bytecode')
+    # 실행 중 캐시 폴더 (None이면 TEMPLATE_BYTECODE_DIR 사용, Vercel은 /tmp만 쓰기 가능)
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR') or \
+        ('/tmp/jinja_bytecode' if is_vercel_environment() else None)
+    
+    # 스트리밍 렌더링 (아카이브 목록/상세 페이지) - 이 크기(바이트)만큼 모아서 전송
+    STREAM_CHUNK_SIZE = 4096
+    
+    # 캐시 예열 (글 변경/앱 시작 후 백그라운드 실행)
+    # Vercel 서버리스는 응답 후 백그라운드 작업이 멈추므로 기본 비활성화 (flask warm-cache로 수동 실행)
+    CACHE_WARMUP_ENABLED = os.environ.get(
+        'CACHE_WARMUP_ENABLED', 'False' if is_vercel_environment() else 'True'
+    ).lower() == 'true'
+    CACHE_WARMUP_PAGES = int(os.environ.get('CACHE_WARMUP_PAGES', '3'))  # 카테고리별 예열 페이지 수
+    CACHE_WARMUP_IMAGES = 8  # 예열할 최신 갤러리 이미지 수
+    CACHE_WARMUP_IMAGE_WIDTHS = [320, 640]  # 예열할 이미지 너비 (목록 썸네일 srcset에서 주로 선택되는 단계)
+    CACHE_WARMUP_LANGUAGES = ['ko', 'en']
+    
+    # 동적 응답(HTML/JSON) 압축 설정 - 압축 프록시가 있으면 COMPRESS_ENABLED=false
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = 1024  # 바이트, 이보다 작은 응답은 압축하지 않음
+    COMPRESS_LEVEL = 6  # gzip 압축 레벨
+    COMPRESS_BR_QUALITY = 5  # brotli 압축 품질 (0-11)
+    COMPRESS_CACHE_TIMEOUT = 120  # 압축 결과 캐싱 시간 (페이지 캐시와 동일)
+    
+    # 이미지 바이트 메모리 캐시 (get_image / get_post_image, 워커 프로세스별)
+    IMAGE_CACHE_MAX_MB = float(os.environ.get('IMAGE_CACHE_MAX_MB', '64'))  # 전체 용량
+    IMAGE_CACHE_MAX_ENTRY_MB = 4  # 이미지 하나의 최대 크기 (이보다 크면 캐시하지 않음)
+    IMAGE_CACHE_TTL = 60  # 항목 유효 시간 (초) - 다른 워커에서 이미지가 바뀐 경우 이전 이미지를 내보낼 수 있는 최대 시간
+    
     # 티스토리 RSS 연동 설정
     TISTORY_RSS_URL = os.environ.get('TISTORY_RSS_URL', '')  # 예: https://yourblog.tistory.com/rss
     TISTORY_AUTO_SYNC_ENABLED = os.environ.get('TISTORY_AUTO_SYNC_ENABLED', 'False').lower() == 'true'
@@ -72,3 +131,16 @@ class Config:
         except Exception:
             UPLOAD_FOLDER = os.path.join('/tmp', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+    # 업로드 파일 중 이 크기까지만 메모리에 두고 나머지는 임시 파일로 스풀 (None이면 시스템 임시 폴더)
+    UPLOAD_SPOOL_MAX_MEMORY = 512 * 1024
+    UPLOAD_SPOOL_DIR = None
+    # 분할 업로드 (/upload) - 파일 하나의 최대 크기, 완료되지 않은 조각 보관 시간(초)
+    CHUNKED_UPLOAD_MAX_BYTES = 64 * 1024 * 1024
+    UPLOAD_CHUNK_TTL = 24 * 3600
+    IMAGE_MAX_PIXELS = 64 * 1024 * 1024  # 디코딩을 허용할 최대 픽셀 수 (메모리 사용량 제한)
+    # Accept 헤더에 image/avif가 있으면 AVIF로 변환 (Pillow에 AVIF 인코더가 없으면 WebP 사용)
+    IMAGE_AVIF_ENABLED = os.environ.get('IMAGE_AVIF_ENABLED', 'true').lower() == 'true'
+    
+    # 이미지 렌디션 디스크 캐시 (UPLOAD_FOLDER/renditions) 최대 용량 - 0이면 비활성화
+    # Vercel의 /tmp는 512MB 제한이 있으므로 절반만 사용
+    RENDITION_CACHE_MAX_MB = float(os.environ.get('RENDITION_CACHE_MAX_MB', '256'))